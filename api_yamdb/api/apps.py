@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.core.checks import register
 
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from api_yamdb.db import connect_signals
+
+        from . import signals  # noqa: F401
+        from .checks import check_shared_cache
+        connect_signals()
+        register(check_shared_cache, deploy=True)
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import LocalLRUCache, get_version
+
+local_users = LocalLRUCache(
+    settings.AUTH_USER_CACHE_LOCAL_SIZE,
+    settings.AUTH_USER_CACHE_TIMEOUT,
+)
+
+
+# поля пользователя, нужные аутентификации и проверке прав; пароль и код
+# подтверждения в кеш не попадают
+CACHED_USER_FIELDS = (
+    'id', 'username', 'role', 'is_active', 'is_staff', 'is_superuser',
+)
+
+
+def user_version_name(user_id):
+    return f'users.user:{user_id}'
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication, который берёт пользователя из кеша.
+
+    Сначала проверяется кеш процесса, затем общий кеш Django и только потом
+    база. Ключ содержит версию пользователя, которая меняется при каждом
+    сохранении. В другие процессы изменение роли приходит сразу, только
+    если кеш Django общий (CACHE_BACKEND); с LocMemCache — через
+    AUTH_USER_CACHE_TIMEOUT.
+
+    В кеше лежат только CACHED_USER_FIELDS; остальные поля пользователя
+    отложены и загружаются из базы при обращении.
+    """
+
+    @cached_property
+    def cached_fields(self):
+        # from_db() раскладывает значения в порядке полей модели
+        return [
+            field.attname for field in self.user_model._meta.concrete_fields
+            if field.attname in CACHED_USER_FIELDS
+        ]
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        user = self.get_cached_user(user_id)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
+
+    def get_cached_user(self, user_id):
+        version = get_version(user_version_name(user_id))
+        key = f'auth:user:{user_id}:{version}'
+        values = local_users.get(key)
+        if values is None:
+            values = cache.get(key)
+            if values is None:
+                values = self.user_model.objects.filter(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                ).values_list(*self.cached_fields).first()
+                if values is None:
+                    raise AuthenticationFailed(
+                        _('User not found'), code='user_not_found'
+                    )
+                cache.set(key, values, settings.AUTH_USER_CACHE_TIMEOUT)
+            local_users.set(key, values)
+        # новый экземпляр на каждый запрос: запрос может изменить request.user
+        return self.user_model.from_db(
+            self.user_model.objects.db, self.cached_fields, values
+        )
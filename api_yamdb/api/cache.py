@@ -0,0 +1,113 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.http import urlencode
+
+
+def version_key(name):
+    return f'version:{name}'
+
+
+def get_version(name):
+    return cache.get_or_set(version_key(name), lambda: uuid4().hex, None)
+
+
+def get_versions(names):
+    """Версии нескольких имён за одно обращение к кешу."""
+    keys = [version_key(name) for name in names]
+    versions = cache.get_many(keys)
+    return [
+        versions[key] if key in versions else get_version(name)
+        for name, key in zip(names, keys)
+    ]
+
+
+def bump_version(name):
+    # новое случайное значение, а не счётчик: после вытеснения из кеша
+    # версия не может совпасть со старой
+    cache.set(version_key(name), uuid4().hex, None)
+
+
+def title_version_name(pk):
+    return f'titcatgen.title:{pk}'
+
+
+def bump_title_versions(*pks):
+    """Сбрасывает кеш списков произведений и страниц произведений pks.
+
+    Версии меняются сразу и ещё раз после коммита: ответ, собранный
+    до коммита другим запросом, мог попасть в кеш под новой версией.
+    """
+    names = ('titcatgen.title', *map(title_version_name, pks))
+
+    def bump():
+        cache.set_many(
+            {version_key(name): uuid4().hex for name in names}, None
+        )
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def query_fingerprint(query_params):
+    query = urlencode(sorted(
+        (key, sorted(values)) for key, values in query_params.lists()
+    ), doseq=True)
+    return hashlib.md5(query.encode()).hexdigest()
+
+
+def make_etag(data):
+    content = DjangoJSONEncoder(sort_keys=True).encode(data)
+    return '"{}"'.format(hashlib.md5(content.encode()).hexdigest())
+
+
+def timestamp_etag(value):
+    # микросекунды: два изменения за одну секунду дают разные ETag
+    return '"{:x}"'.format(round(value.timestamp() * 10 ** 6))
+
+
+class LocalLRUCache:
+    """Небольшой кеш в памяти процесса с ограничением размера и TTL.
+
+    При sliding=True срок хранения отсчитывается от последнего чтения,
+    а не от записи.
+    """
+
+    def __init__(self, max_size, timeout, sliding=False):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.sliding = sliding
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            now = time.monotonic()
+            if expires < now:
+                del self.items[key]
+                return None
+            if self.sliding:
+                self.items[key] = (now + self.timeout, value)
+            self.items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.items[key] = (time.monotonic() + self.timeout, value)
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Warning
+
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def check_shared_cache(app_configs, **kwargs):
+    """Счётчики ограничения частоты и версии кеша живут в кеше Django."""
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [Warning(
+        f'Кеш {backend} свой у каждого процесса: ограничение частоты '
+        'запросов действует на процесс, а не на сервис целиком, и '
+        'изменения пользователей и данных доходят до других процессов '
+        'только по истечении AUTH_USER_CACHE_TIMEOUT и '
+        'RESPONSE_CACHE_TIMEOUT.',
+        hint='Для нескольких процессов задайте общий кеш переменными '
+             'CACHE_BACKEND и CACHE_LOCATION.',
+        id='api.W001',
+    )]
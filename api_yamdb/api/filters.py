@@ -1,6 +1,7 @@
 from django_filters.rest_framework import CharFilter, FilterSet
 
 from titcatgen.models import Title
+from titcatgen.search import search_titles
 
 
 class TitleFilter(FilterSet):
@@ -14,7 +15,11 @@ class TitleFilter(FilterSet):
         field_name='name',
         lookup_expr='contains'
     )
+    q = CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('category', 'genre', 'name', 'year')
+        fields = ('category', 'genre', 'name', 'year', 'q')
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
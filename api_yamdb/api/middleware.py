@@ -0,0 +1,110 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+NUMBER = re.compile(r'\b\d+\b')
+STRING = re.compile(r"'(?:[^']|'')*'")
+PLACEHOLDERS = re.compile(r'%s(?:\s*,\s*%s)+')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def fingerprint(sql):
+    sql = STRING.sub('?', sql)
+    sql = NUMBER.sub('?', sql)
+    return PLACEHOLDERS.sub('%s, ...', sql)
+
+
+class QueryProfile:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def repeated(self, limit=3):
+        return [
+            (sql, count)
+            for sql, count in self.fingerprints.most_common(limit)
+            if count > 1
+        ]
+
+
+class QueryProfilerMiddleware:
+    """Считает SQL-запросы каждого запроса и сверяет их с бюджетом.
+
+    Количество и суммарное время отдаются в заголовках X-DB-Queries и
+    X-DB-Time-ms. Бюджеты задаются в QUERY_BUDGETS по имени URL, например
+    'api:titles-list' или 'GET api:titles-list'. У потоковых ответов
+    заголовки уходят раньше тела, поэтому их запросы только сверяются
+    с бюджетом после чтения потока.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = QueryProfile()
+        with self.profiling(profile):
+            response = self.get_response(request)
+        if response.streaming:
+            response.streaming_content = self.profile_stream(
+                request, response.streaming_content, profile
+            )
+            return response
+        response['X-DB-Queries'] = str(profile.count)
+        response['X-DB-Time-ms'] = f'{profile.duration * 1000:.2f}'
+        self.check_budget(request, profile)
+        return response
+
+    @contextmanager
+    def profiling(self, profile):
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(profile)
+                )
+            yield
+
+    def profile_stream(self, request, content, profile):
+        # поток читается после выхода из middleware
+        with self.profiling(profile):
+            yield from content
+        self.check_budget(request, profile)
+
+    def check_budget(self, request, profile):
+        match = request.resolver_match
+        if match is None:
+            return
+        budgets = settings.QUERY_BUDGETS
+        budget = budgets.get(
+            f'{request.method} {match.view_name}',
+            budgets.get(match.view_name, settings.QUERY_BUDGET_DEFAULT),
+        )
+        if budget is None or profile.count <= budget:
+            return
+        message = (
+            f'{request.method} {match.view_name}: {profile.count} SQL '
+            f'запросов при бюджете {budget}; '
+            f'повторяются: {profile.repeated()}'
+        )
+        if settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -1,13 +1,93 @@
+import csv
+import time
+from calendar import timegm
+from datetime import datetime
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
 from rest_framework.mixins import (
     CreateModelMixin, DestroyModelMixin, ListModelMixin)
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
-from .permissions import AdminAuthorizedOrReadOnly
+from api_yamdb.db import read_from_primary, read_from_replicas
+from reviews.models import Review
+from titcatgen.models import Title
+from .cache import (get_versions, make_etag, query_fingerprint,
+                    timestamp_etag)
+from .permissions import AdminAuthorizedOrReadOnly, AdminOrUserOrReadOnly
+from .serializers import requested_expand, requested_fields
+
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class CachedResponseMixin:
+    """Данные ответов GET хранятся в кеше под ключом с версиями.
+
+    Имена версий возвращает get_cache_versions(); сигналы меняют версии
+    при изменении данных, и старые записи больше не читаются. ETag и
+    Last-Modified записи позволяют отвечать 304 без обращения к БД.
+    Промах кеша собирается по основной базе: отстающая реплика не должна
+    попасть в кеш под новой версией.
+    """
+
+    def get_cache_versions(self):
+        raise NotImplementedError
+
+    def get_cache_headers(self):
+        return {}
+
+    def get_response_cache_key(self, request):
+        versions = get_versions(self.get_cache_versions())
+        # ссылки пагинации содержат адрес сервера
+        return ':'.join((
+            'response', self.basename, self.action,
+            *map(str, self.kwargs.values()),
+            request.get_host(), *versions,
+            query_fingerprint(request.query_params),
+        ))
+
+    def cached_response(self, request, build):
+        cache_key = self.get_response_cache_key(request)
+        cached = cache.get(cache_key)
+        if cached is None:
+            with read_from_primary():
+                response = build()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cached = (make_etag(response.data), int(time.time()),
+                      response.data)
+            cache.set(cache_key, cached, settings.RESPONSE_CACHE_TIMEOUT)
+        etag, last_modified, data = cached
+        response = Response(data, headers={
+            'ETag': etag,
+            'Last-Modified': http_date(last_modified),
+            **self.get_cache_headers(),
+        })
+        return get_conditional_response(
+            request, etag=etag, last_modified=last_modified,
+            response=response,
+        )
 
 
 class CategoryGenreMixinViewSet(
+        CachedResponseMixin,
         ListModelMixin,
         CreateModelMixin,
         DestroyModelMixin,
@@ -19,3 +99,232 @@ class CategoryGenreMixinViewSet(
     lookup_field = 'slug'
     permission_classes = (AdminAuthorizedOrReadOnly,)
     pagination_class = PageNumberPagination
+
+    def get_cache_versions(self):
+        return (self.queryset.model._meta.label_lower,)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, partial(super().list, request, *args, **kwargs)
+        )
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+class ExportMixin:
+    export_name = None
+    export_fields = ()
+    export_chunk_size = 2000
+
+    def get_export_queryset(self):
+        return self.filter_queryset(
+            self.get_queryset()
+        ).prefetch_related(None).order_by('pk')
+
+    def export_rows(self, queryset, fields):
+        return queryset.values_list(*fields).iterator(
+            chunk_size=self.export_chunk_size
+        )
+
+    def stream_ndjson(self, rows, fields):
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        for row in rows:
+            yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+    def stream_csv(self, rows, fields):
+        writer = csv.writer(Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            # без потери микросекунд, чтобы import_csv восстановил даты
+            yield writer.writerow([
+                value.isoformat() if isinstance(value, datetime)
+                else value
+                for value in row
+            ])
+
+    def export_response(self, request, queryset, name, fields):
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_CONTENT_TYPES:
+            return Response(
+                {'export_format': 'Допустимые форматы: ndjson, csv.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        stream = getattr(self, f'stream_{export_format}')
+        response = StreamingHttpResponse(
+            stream(self.export_rows(queryset, fields), fields),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{name}.{export_format}"'
+        )
+        return response
+
+    @action(
+        detail=False,
+        methods=('get',),
+        permission_classes=(AdminOrUserOrReadOnly,),
+    )
+    def export(self, request, *args, **kwargs):
+        return self.export_response(
+            request, self.get_export_queryset(),
+            self.export_name, self.export_fields,
+        )
+
+
+class TitleNestedMixin:
+    """Произведение из URL, загруженное один раз за запрос."""
+
+    @cached_property
+    def parent_title(self):
+        return get_object_or_404(
+            Title.objects.only('id', 'name'),
+            pk=self.kwargs.get('title_id'),
+        )
+
+
+class ReviewNestedMixin(TitleNestedMixin):
+    """Отзыв и его произведение из URL одним запросом с JOIN.
+
+    Если отзыв относится к другому произведению, возвращается 404.
+    """
+
+    @cached_property
+    def parent_review(self):
+        review = get_object_or_404(
+            Review.objects.select_related('title').only(
+                'id', 'text', 'title__id', 'title__name'
+            ),
+            pk=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id'),
+        )
+        self.__dict__['parent_title'] = review.title
+        return review
+
+
+class ConditionalObjectMixin:
+    """ETag и Last-Modified отдельного объекта по полю updated_at.
+
+    Условный GET сверяется с одной выборкой updated_at по первичному ключу
+    и получает 304 без сериализации. Изменение и удаление с устаревшим
+    If-Match или If-Unmodified-Since получают 412; на время проверки
+    строка блокируется до конца транзакции.
+    """
+    modified_object = None
+
+    def get_modified_queryset(self):
+        raise NotImplementedError
+
+    def get_updated_at(self, lock=False):
+        queryset = self.get_modified_queryset()
+        if lock:
+            queryset = queryset.select_for_update()
+        return queryset.filter(
+            pk=self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        ).values_list('updated_at', flat=True).first()
+
+    def get_validators(self, updated_at):
+        return {
+            'ETag': timestamp_etag(updated_at),
+            'Last-Modified': http_date(timegm(updated_at.utctimetuple())),
+        }
+
+    def get_object(self):
+        self.modified_object = super().get_object()
+        return self.modified_object
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.modified_object = serializer.instance
+
+    def conditional_response(self, request, build, lock=False):
+        conditions = ('HTTP_IF_MATCH', 'HTTP_IF_UNMODIFIED_SINCE')
+        if request.method in SAFE_METHODS:
+            conditions = ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE')
+        updated_at = None
+        if any(condition in request.META for condition in conditions):
+            updated_at = self.get_updated_at(lock)
+        if updated_at is not None:
+            # заголовки из validators попадут в ответ 304; если условия
+            # выполнены, get_conditional_response вернёт его же
+            validators = Response(headers=self.get_validators(updated_at))
+            response = get_conditional_response(
+                request,
+                etag=validators['ETag'],
+                last_modified=timegm(updated_at.utctimetuple()),
+                response=validators,
+            )
+            if response is not validators:
+                return response
+        response = build()
+        if self.modified_object is not None and response.status_code == 200:
+            for header, value in self.get_validators(
+                self.modified_object.updated_at
+            ).items():
+                response[header] = value
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, partial(super().retrieve, request, *args, **kwargs)
+        )
+
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, partial(super().update, request, *args, **kwargs),
+            lock=True,
+        )
+
+    @transaction.atomic
+    def destroy(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, partial(super().destroy, request, *args, **kwargs),
+            lock=True,
+        )
+
+
+class ReplicaReadMixin:
+    """Читающие запросы к вьюсету обслуживаются репликами базы."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replicas():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class SparseFieldsMixin:
+    """Поля ответа из ?fields= и ?expand= для выборки из БД."""
+
+    def get_response_fields(self):
+        # None — в ответ попадут все поля сериализатора
+        fields = requested_fields(self.request)
+        if fields is None:
+            return None
+        return fields | requested_expand(self.request)
+
+
+class LeanListMixin:
+    """Список собирается lean_serializer_class из строк .values().
+
+    Если сериализатор не задан или не поддерживает запрошенные поля,
+    работает обычный list().
+    """
+    lean_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        lean = None
+        if self.lean_serializer_class is not None:
+            lean = self.lean_serializer_class(self.get_serializer_context())
+        if lean is None or not lean.supports():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(
+            self.get_queryset()
+        ).prefetch_related(None).values(*lean.get_columns())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(lean.to_representation(page))
+        return Response(lean.to_representation(queryset))
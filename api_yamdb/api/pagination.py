@@ -0,0 +1,30 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class PubDateCursorPagination(CursorPagination):
+    ordering = ('pub_date', 'id')
+
+    def decode_cursor(self, request):
+        # пустой ?cursor= включает курсорный режим с первой страницы
+        if not request.query_params.get(self.cursor_query_param):
+            return None
+        return super().decode_cursor(request)
+
+
+class OptionalCursorPagination(LimitOffsetPagination):
+    cursor_pagination_class = PubDateCursorPagination
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        if cursor_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = self.cursor_pagination_class()
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is None:
+            return super().get_paginated_response(data)
+        return self.cursor_paginator.get_paginated_response(data)
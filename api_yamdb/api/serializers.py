@@ -4,14 +4,55 @@ from rest_framework.serializers import (
     Serializer
 )
 from rest_framework import serializers
-from django.shortcuts import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.relations import SlugRelatedField
 
-from titcatgen.models import Category, Genre, Title
-from reviews.models import Review, Comment
+from titcatgen.models import Category, Genre, Title, TitleQuerySet
+from reviews.models import Review, Comment, ReviewQuerySet, TitleRatingStats
 from users.models import User
 
 
+def query_param_set(request, name):
+    if request is None or name not in request.query_params:
+        return None
+    return set(filter(None, request.query_params[name].split(',')))
+
+
+def requested_fields(request):
+    """Поля из ?fields= для чтения или None, если ограничений нет."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    return query_param_set(request, 'fields')
+
+
+def requested_expand(request):
+    return query_param_set(request, 'expand') or set()
+
+
+class SparseFieldsetMixin:
+    """Оставляет в ответе только поля из ?fields=.
+
+    Поля из expandable_fields отдаются, только если их запросили через
+    ?expand= или ?fields=.
+    """
+    expandable_fields = ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        requested = requested_fields(request)
+        shown = requested_expand(request) | (requested or set())
+        for name in self.expandable_fields:
+            if name not in shown:
+                del fields[name]
+        if requested is not None:
+            fields = {
+                name: field for name, field in fields.items()
+                if name in shown
+            }
+        return fields
+
+
 class CategorySerializer(ModelSerializer):
     class Meta:
         model = Category
@@ -37,20 +78,151 @@ class TitleCreateSerializer(ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('rating_sum', 'rating_count', 'weighted_rating')
+
+
+class TitleBulkSerializer(ModelSerializer):
+    """Элемент массовой загрузки: slug'и проверяются без запросов к БД."""
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+
+    class Meta:
+        model = Title
+        fields = ('name', 'year', 'description', 'category', 'genre')
+
+
+class TitleRatingStatsSerializer(Serializer):
+    count = serializers.IntegerField()
+    mean = serializers.FloatField()
+    median = serializers.FloatField()
+    stddev = serializers.FloatField()
+    histogram = serializers.DictField(child=serializers.IntegerField())
+
+
+class LeanListSerializer:
+    """Список из строк .values() без экземпляров моделей.
+
+    Набор и порядок полей берутся у serializer_class, значения приводятся
+    его же полями. Поле читается из колонки columns[name] или собирается
+    методом represent_<name>(row); если для поля нет ни того, ни другого,
+    быстрый путь не поддерживается.
+    """
+    serializer_class = None
+    # поле ответа -> колонки values()
+    columns = {}
+    # колонки, нужные всегда, например ключи сортировки курсора
+    required_columns = ('id',)
+
+    def __init__(self, context):
+        self.context = context
+        self.fields = self.serializer_class(context=context).fields
+
+    def supports(self):
+        return all(
+            hasattr(self, f'represent_{name}') or len(
+                self.columns.get(name, ())
+            ) == 1
+            for name in self.fields
+        )
 
+    def get_columns(self):
+        columns = set(self.required_columns)
+        for name in self.fields:
+            columns.update(self.columns[name])
+        return columns
 
-class TitleSerializer(ModelSerializer):
+    def load(self, rows):
+        """Пакетная загрузка связанных данных для страницы."""
+
+    def get_converter(self, name):
+        represent = getattr(self, f'represent_{name}', None)
+        if represent is not None:
+            return represent
+        column, = self.columns[name]
+        to_representation = self.fields[name].to_representation
+
+        def convert(row):
+            value = row[column]
+            return None if value is None else to_representation(value)
+        return convert
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        self.load(rows)
+        converters = [
+            (name, self.get_converter(name)) for name in self.fields
+        ]
+        return [
+            {name: convert(row) for name, convert in converters}
+            for row in rows
+        ]
+
+
+class TitleSerializer(SparseFieldsetMixin, ModelSerializer):
     category = CategorySerializer()
     genre = GenreSerializer(many=True)
     rating = serializers.IntegerField(read_only=True)
+    stats = serializers.SerializerMethodField()
+    expandable_fields = ('stats',)
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('rating_sum', 'rating_count', 'weighted_rating')
+
+    def get_stats(self, title):
+        return TitleRatingStatsSerializer(
+            TitleRatingStats.for_title(title)
+        ).data
 
 
-class ReviewSerializer(ModelSerializer):
+class TitleTopSerializer(TitleSerializer):
+    weighted_rating = serializers.FloatField(read_only=True)
+    reviews_count = serializers.IntegerField(
+        source='rating_count', read_only=True
+    )
+
+    class Meta(TitleSerializer.Meta):
+        exclude = ('rating_sum', 'rating_count')
+
+
+class TitleTopQuerySerializer(Serializer):
+    by = serializers.ChoiceField(
+        choices=('rating', 'reviews'), default='rating'
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class LeanTitleSerializer(LeanListSerializer):
+    serializer_class = TitleSerializer
+    columns = TitleQuerySet.API_FIELDS
+
+    def load(self, rows):
+        self.genres = {}
+        if 'genre' not in self.fields:
+            return
+        genres = Title.genre.through.objects.filter(
+            title_id__in=[row['id'] for row in rows]
+        ).order_by('genre__slug').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        )
+        for title_id, name, slug in genres:
+            self.genres.setdefault(title_id, []).append(
+                {'name': name, 'slug': slug}
+            )
+
+    def represent_category(self, row):
+        if row['category__slug'] is None:
+            return None
+        return {
+            'name': row['category__name'],
+            'slug': row['category__slug'],
+        }
+
+    def represent_genre(self, row):
+        return self.genres.get(row['id'], [])
+
+
+class ReviewSerializer(SparseFieldsetMixin, ModelSerializer):
     title = SlugRelatedField(
         slug_field='name',
         read_only=True,
@@ -60,11 +232,9 @@ class ReviewSerializer(ModelSerializer):
         read_only=True,
     )
 
-    # нужен котекст, он не передаётся
     def validate(self, data):
         request = self.context['request']
-        title_id = self.context.get('view').kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
+        title = self.context['view'].parent_title
         if (
             request.method == 'POST'
             and Review.objects.filter(
@@ -82,7 +252,20 @@ class ReviewSerializer(ModelSerializer):
         )
 
 
-class CommentSerializer(ModelSerializer):
+class LeanReviewSerializer(LeanListSerializer):
+    serializer_class = ReviewSerializer
+    columns = ReviewQuerySet.API_FIELDS
+    required_columns = ('id', 'pub_date')
+
+    def represent_author(self, row):
+        return row['author__username']
+
+    def represent_title(self, row):
+        # отзывы списка относятся к одному произведению из URL
+        return self.context['view'].parent_title.name
+
+
+class CommentSerializer(SparseFieldsetMixin, ModelSerializer):
     review = SlugRelatedField(
         slug_field='text',
         read_only=True
@@ -91,7 +274,7 @@ class CommentSerializer(ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = '__all__'
+        fields = ('id', 'review', 'text', 'author', 'pub_date')
 
 
 class UsersSerializer(ModelSerializer):
@@ -0,0 +1,52 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from reviews.models import Review
+from titcatgen.models import Category, Genre, Title
+from users.models import User
+from .authentication import user_version_name
+from .cache import bump_title_versions, bump_version
+
+
+def bump_model_version(sender, **kwargs):
+    bump_version(sender._meta.label_lower)
+
+
+for model in (Category, Genre):
+    post_save.connect(bump_model_version, sender=model)
+    post_delete.connect(bump_model_version, sender=model)
+
+
+def bump_title(sender, instance, **kwargs):
+    bump_title_versions(instance.pk)
+
+
+def bump_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        bump_title_versions(instance.pk)
+    elif pk_set is not None:
+        bump_title_versions(*pk_set)
+    else:
+        # жанр отвязан от всех произведений
+        bump_version(Genre._meta.label_lower)
+
+
+def bump_reviewed_title(sender, instance, **kwargs):
+    # рейтинг произведения меняется вместе с отзывами
+    bump_title_versions(instance.title_id)
+
+
+post_save.connect(bump_title, sender=Title)
+post_delete.connect(bump_title, sender=Title)
+m2m_changed.connect(bump_title_genres, sender=Title.genre.through)
+post_save.connect(bump_reviewed_title, sender=Review)
+post_delete.connect(bump_reviewed_title, sender=Review)
+
+
+def bump_user_version(sender, instance, **kwargs):
+    bump_version(user_version_name(instance.pk))
+
+
+post_save.connect(bump_user_version, sender=User)
+post_delete.connect(bump_user_version, sender=User)
@@ -0,0 +1,141 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import SimpleRateThrottle
+
+from .cache import LocalLRUCache
+
+# корзины процесса: область -> LocalLRUCache
+local_buckets = {}
+local_buckets_lock = threading.Lock()
+
+
+def add_to_counter(key, delta, timeout):
+    """Атомарно прибавляет delta к счётчику в общем кеше."""
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        if cache.add(key, delta, timeout):
+            return delta
+        return cache.incr(key, delta)
+
+
+class TokenBucket:
+    """Корзина токенов в памяти процесса.
+
+    Потраченные токены копятся в pending и раз в THROTTLE_SYNC_INTERVAL
+    секунд или каждые capacity / 10 токенов прибавляются к общему счётчику
+    в кеше. Всё, что сверх этого насчитали другие процессы, вычитается
+    из корзины, поэтому общий расход ограничен той же ставкой. Это
+    верно, только если кеш Django общий для процессов: с LocMemCache
+    у каждого процесса свой счётчик, и ставка действует на процесс
+    (см. проверку api.W001).
+    """
+
+    def __init__(self, key, capacity, duration):
+        self.key = key
+        self.capacity = capacity
+        self.duration = duration
+        self.rate = capacity / duration
+        self.sync_batch = max(1, capacity // 10)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.pending = 0
+        self.seen = None
+        self.synced = None
+        self.lock = threading.Lock()
+
+    def needs_sync(self, now):
+        return (
+            self.synced is None
+            or self.pending >= self.sync_batch
+            or now - self.synced >= settings.THROTTLE_SYNC_INTERVAL
+        )
+
+    def sync(self, now):
+        total = add_to_counter(self.key, self.pending, self.duration)
+        if self.seen is not None:
+            # счётчик мог истечь и начаться заново
+            self.tokens -= max(total - self.seen - self.pending, 0)
+        self.seen = total
+        self.pending = 0
+        self.synced = now
+
+    def consume(self):
+        now = time.monotonic()
+        with self.lock:
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated) * self.rate,
+            )
+            self.updated = now
+            if self.needs_sync(now):
+                self.sync(now)
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            self.pending += 1
+            return True
+
+    def wait(self):
+        return max(1 - self.tokens, 0) / self.rate
+
+
+def get_bucket(scope, key, capacity, duration):
+    with local_buckets_lock:
+        buckets = local_buckets.get(scope)
+        if buckets is None:
+            # срок считается от последнего запроса: через duration без
+            # запросов корзина и так полна, а активная не начнётся заново
+            buckets = local_buckets[scope] = LocalLRUCache(
+                settings.THROTTLE_LOCAL_SIZE, duration, sliding=True
+            )
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(key, capacity, duration)
+            buckets.set(key, bucket)
+    return bucket
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Ограничение частоты запросов корзиной токенов.
+
+    Область берётся из throttle_scopes представления по HTTP-методу или из
+    throttle_scope, ставка — из DEFAULT_THROTTLE_RATES: '10/min' означает
+    корзину на 10 токенов, которая полностью восстанавливается за минуту.
+    Пользователи считаются по id, анонимные запросы — по IP.
+    """
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def __init__(self):
+        # область и ставка известны только в allow_request
+        self.bucket = None
+
+    def get_scope(self, request, view):
+        method = 'GET' if request.method == 'HEAD' else request.method
+        scopes = getattr(view, 'throttle_scopes', {})
+        return scopes.get(method, getattr(view, 'throttle_scope', None))
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(request, view)
+        if self.scope is None:
+            return True
+        capacity, duration = self.parse_rate(self.get_rate())
+        if capacity is None:
+            return True
+        self.bucket = get_bucket(
+            self.scope, self.get_cache_key(request, view), capacity, duration
+        )
+        return self.bucket.consume()
+
+    def wait(self):
+        return self.bucket.wait()
@@ -1,6 +1,8 @@
-from django.db.models import Avg
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django.core.mail import EmailMessage
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework.views import APIView
@@ -12,8 +14,13 @@ from rest_framework.filters import SearchFilter
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .cache import bump_title_versions, title_version_name
 from .filters import TitleFilter
-from .mixins import CategoryGenreMixinViewSet
+from .mixins import (CachedResponseMixin, CategoryGenreMixinViewSet,
+                     ConditionalObjectMixin, ExportMixin, LeanListMixin,
+                     ReplicaReadMixin, ReviewNestedMixin, SparseFieldsMixin,
+                     TitleNestedMixin)
+from .pagination import OptionalCursorPagination
 from .permissions import (AdminAuthorizedOrReadOnly,
                           AuthorModeratorAdminOrReadOnly,
                           AdminOrUserOrReadOnly,
@@ -24,30 +31,229 @@ from .serializers import (GetTokenSerializer,
                           UsersSerializer,
                           CategorySerializer,
                           GenreSerializer,
+                          LeanReviewSerializer,
+                          LeanTitleSerializer,
                           TitleSerializer,
                           ReviewSerializer,
                           CommentSerializer,
-                          TitleCreateSerializer)
+                          TitleBulkSerializer,
+                          TitleCreateSerializer,
+                          TitleRatingStatsSerializer,
+                          TitleTopQuerySerializer,
+                          TitleTopSerializer,
+                          requested_expand)
+from reviews.models import (HISTOGRAM_FIELDS, Comment, Review,
+                            TitleRatingStats)
 from titcatgen.models import Category, Genre, Title
-from reviews.models import Review
-from users.models import User
+from users.models import EmailOutbox, User
+
+# колонки выгрузок совпадают с файлами static/data для import_csv
+REVIEW_EXPORT_FIELDS = (
+    'id', 'title_id', 'text', 'author_id', 'score', 'pub_date'
+)
+COMMENT_EXPORT_FIELDS = ('id', 'review_id', 'text', 'author_id', 'pub_date')
 
 
-class TitleViewSet(ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).all().order_by('name')
+class TitleViewSet(
+        ReplicaReadMixin, CachedResponseMixin, SparseFieldsMixin,
+        LeanListMixin, ExportMixin, ModelViewSet):
+    queryset = Title.objects.for_api()
     serializer_class = TitleSerializer
+    lean_serializer_class = LeanTitleSerializer
     permission_classes = (AdminAuthorizedOrReadOnly,)
     pagination_class = PageNumberPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    throttle_scopes = {'GET': 'read'}
+    export_name = 'titles'
+    export_fields = ('id', 'name', 'year', 'category_id')
+
+    bulk_max_items = 1000
+
+    def get_queryset(self):
+        fields = self.get_response_fields()
+        queryset = Title.objects.for_api(fields)
+        if fields is None:
+            fields = requested_expand(self.request)
+        if 'stats' in fields:
+            # распределения оценок страницы загружаются одним запросом
+            queryset = queryset.prefetch_related('rating_stats')
+        return queryset
+
+    def get_cache_versions(self):
+        if self.action == 'retrieve':
+            title = title_version_name(self.kwargs['pk'])
+        else:
+            title = Title._meta.label_lower
+        return (
+            title, Category._meta.label_lower, Genre._meta.label_lower
+        )
+
+    def get_cache_headers(self):
+        return {
+            'Cache-Control': f'public, max-age={settings.TITLE_CACHE_MAX_AGE}'
+        }
+
+    def anonymous_cached_response(self, request, build):
+        # ответы анонимным пользователям кешируются здесь и в прокси
+        if request.user.is_authenticated:
+            return build()
+        return self.cached_response(request, build)
+
+    def list(self, request, *args, **kwargs):
+        return self.anonymous_cached_response(
+            request, partial(super().list, request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.anonymous_cached_response(
+            request, partial(super().retrieve, request, *args, **kwargs)
+        )
+
+    def get_top(self, request):
+        params = TitleTopQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        # без пагинации: COUNT(*) по каталогу не нужен
+        queryset = self.filter_queryset(self.get_queryset()).top(
+            params.validated_data['by']
+        )[:params.validated_data['limit']]
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    @action(detail=False, methods=('get',))
+    def top(self, request):
+        return self.anonymous_cached_response(
+            request, partial(self.get_top, request)
+        )
 
     def get_serializer_class(self):
+        if self.action == 'bulk':
+            return TitleBulkSerializer
+        if self.action == 'top':
+            return TitleTopSerializer
+        if self.action == 'stats':
+            return TitleRatingStatsSerializer
         if self.request.method in ('POST', 'PATCH',):
             return TitleCreateSerializer
         return TitleSerializer
 
+    @action(detail=True, methods=('get',))
+    def stats(self, request, pk=None):
+        title = get_object_or_404(
+            Title.objects.select_related('rating_stats').only(
+                'id',
+                *(f'rating_stats__{field}' for field in HISTOGRAM_FIELDS),
+            ),
+            pk=pk,
+        )
+        serializer = self.get_serializer(TitleRatingStats.for_title(title))
+        return Response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=('get',),
+        url_path='reviews/export',
+        permission_classes=(AdminOrUserOrReadOnly,),
+    )
+    def export_reviews(self, request):
+        return self.export_response(
+            request, Review.objects.order_by('pk'),
+            ReviewViewSet.export_name, REVIEW_EXPORT_FIELDS,
+        )
+
+    @action(
+        detail=False,
+        methods=('get',),
+        url_path='comments/export',
+        permission_classes=(AdminOrUserOrReadOnly,),
+    )
+    def export_comments(self, request):
+        return self.export_response(
+            request, Comment.objects.order_by('pk'),
+            CommentViewSet.export_name, COMMENT_EXPORT_FIELDS,
+        )
+
+    def build_bulk_titles(self, valid, errors):
+        # все slug'и разрешаются двумя запросами на весь список
+        categories = Category.objects.in_bulk(
+            {data['category'] for _, data in valid}, field_name='slug'
+        )
+        genres = Genre.objects.in_bulk(
+            {slug for _, data in valid for slug in data['genre']},
+            field_name='slug',
+        )
+        built = []
+        for index, data in valid:
+            item_errors = {}
+            if data['category'] not in categories:
+                item_errors['category'] = [
+                    f'Категория {data["category"]} не найдена.'
+                ]
+            missing = [slug for slug in data['genre'] if slug not in genres]
+            if missing:
+                item_errors['genre'] = [
+                    f'Жанр {slug} не найден.' for slug in missing
+                ]
+            if item_errors:
+                errors[index] = item_errors
+                continue
+            title = Title(
+                name=data['name'],
+                year=data['year'],
+                description=data.get('description', ''),
+                category=categories[data['category']],
+            )
+            built.append(
+                (index, title, {genres[slug].pk for slug in data['genre']})
+            )
+        return built
+
+    @action(detail=False, methods=('post',))
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'detail': 'Ожидается непустой список произведений.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {'detail': f'Не более {self.bulk_max_items} произведений '
+                           f'за один запрос.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        valid = []
+        errors = {}
+        for index, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors[index] = serializer.errors
+        built = self.build_bulk_titles(valid, errors)
+        titles = Title.objects.bulk_create_with_genres(
+            [title for _, title, _ in built],
+            [genre_ids for _, _, genre_ids in built],
+        )
+        if titles:
+            # bulk_create не отправляет post_save
+            bump_title_versions()
+        return Response(
+            {
+                'created': [
+                    {'index': index, 'id': title.pk}
+                    for (index, _, _), title in zip(built, titles)
+                ],
+                'errors': [
+                    {'index': index, 'errors': errors[index]}
+                    for index in sorted(errors)
+                ],
+            },
+            status=(
+                status.HTTP_201_CREATED if titles
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
+
 
 class CategoryViewSet(CategoryGenreMixinViewSet):
     queryset = Category.objects.all()
@@ -59,38 +265,52 @@ class GenreViewSet(CategoryGenreMixinViewSet):
     serializer_class = GenreSerializer
 
 
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(
+        ReplicaReadMixin, TitleNestedMixin, ConditionalObjectMixin,
+        SparseFieldsMixin, LeanListMixin, ExportMixin, ModelViewSet):
     serializer_class = ReviewSerializer
+    lean_serializer_class = LeanReviewSerializer
     permission_classes = (AuthorModeratorAdminOrReadOnly,)
+    pagination_class = OptionalCursorPagination
+    throttle_scopes = {'GET': 'read', 'POST': 'review-post'}
+    export_name = 'review'
+    export_fields = REVIEW_EXPORT_FIELDS
 
     def get_queryset(self):
-        title = get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return self.parent_title.reviews.for_api(self.get_response_fields())
+
+    def get_modified_queryset(self):
+        return Review.objects.filter(title_id=self.kwargs.get('title_id'))
 
     def perform_create(self, serializer):
-        title = get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.parent_title)
 
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(
+        ReviewNestedMixin, ConditionalObjectMixin, SparseFieldsMixin,
+        ExportMixin, ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = (
         AuthorModeratorAdminOrReadOnly,
     )
+    pagination_class = OptionalCursorPagination
+    throttle_scopes = {'GET': 'read'}
+    export_name = 'comments'
+    export_fields = COMMENT_EXPORT_FIELDS
 
     def get_queryset(self):
-        review_id = self.kwargs.get('review_id', 'title__id')
-        review = get_object_or_404(Review, id=review_id)
-        return review.comments.all()
+        return self.parent_review.comments.for_api(
+            self.get_response_fields()
+        )
+
+    def get_modified_queryset(self):
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        )
 
     def perform_create(self, serializer):
-        review_id = self.kwargs.get('review_id', 'title__id')
-        review = get_object_or_404(Review, id=review_id)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.parent_review)
 
 
 class UsersViewSet(viewsets.ModelViewSet):
@@ -108,16 +328,18 @@ class UsersViewSet(viewsets.ModelViewSet):
         url_path='me'
     )
     def get_current_user_info(self, request):
-        serializer = UsersSerializer(request.user)
+        # в request.user из кеша аутентификации только часть полей
+        user = User.objects.get(pk=request.user.pk)
+        serializer = UsersSerializer(user)
         if request.method == 'PATCH':
-            if request.user.is_admin:
+            if user.is_admin:
                 serializer = UsersSerializer(
-                    request.user,
+                    user,
                     data=request.data,
                     partial=True)
             else:
                 serializer = NotAdminSerializer(
-                    request.user,
+                    user,
                     data=request.data,
                     partial=True)
             serializer.is_valid(raise_exception=True)
@@ -127,6 +349,8 @@ class UsersViewSet(viewsets.ModelViewSet):
 
 
 class APIGetToken(APIView):
+    throttle_scope = 'token'
+
     def post(self, request):
         serializer = GetTokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -149,26 +373,28 @@ class APIGetToken(APIView):
 
 class APISignup(APIView):
     permission_classes = (permissions.AllowAny,)
+    throttle_scope = 'signup'
 
     @staticmethod
-    def send_email(data):
-        email = EmailMessage(
+    def queue_email(data):
+        # письмо отправит run_mail_worker, запрос его не ждёт
+        EmailOutbox.objects.create(
             body=data['email_body'],
-            to=[data['to_email']]
+            to_email=data['to_email']
         )
-        email.send()
 
     def post(self, request):
         serializer = SignUpSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-        email_body = (
-            f'{user.username}:'
-            f'\nКод: {user.confirmation_code}'
-        )
-        data = {
-            'email_body': email_body,
-            'to_email': user.email,
-        }
-        self.send_email(data)
+        with transaction.atomic():
+            user = serializer.save()
+            email_body = (
+                f'{user.username}:'
+                f'\nКод: {user.confirmation_code}'
+            )
+            data = {
+                'email_body': email_body,
+                'to_email': user.email,
+            }
+            self.queue_email(data)
         return Response(serializer.data, status=status.HTTP_200_OK)
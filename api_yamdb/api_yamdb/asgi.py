@@ -1,7 +1,68 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-from django.core.asgi import get_asgi_application
+import django
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.db import close_old_connections
+from django.urls import Resolver404, resolve
+
+from api_yamdb.db import check_connections
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
+
+class ReadPoolASGIHandler(ASGIHandler):
+    """ASGI-обработчик с отдельным пулом потоков для чтения API.
+
+    В Django 3.0 нет асинхронных view и ORM, и весь синхронный код идёт
+    через sync_to_async, который в asgiref >= 3.3 по умолчанию выполняет
+    его в одном общем потоке — запросы обслуживаются строго по очереди.
+    GET-запросы к представлениям из ASGI_READ_VIEWS выполняются в пуле
+    на ASGI_READ_THREADS потоков, каждый со своим соединением с БД,
+    и не ждут друг друга и общий поток.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.read_executor = ThreadPoolExecutor(
+            max_workers=settings.ASGI_READ_THREADS,
+            thread_name_prefix='asgi-read',
+        )
+
+    def is_pooled_read(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return match.view_name in settings.ASGI_READ_VIEWS
+
+    def get_read_response(self, request):
+        # сигналы начала и конца запроса приходят из другого потока,
+        # поэтому соединения потока пула проверяются здесь
+        check_connections()
+        close_old_connections()
+        try:
+            return super().get_response(request)
+        finally:
+            close_old_connections()
+
+    async def get_response(self, request):
+        if self.is_pooled_read(request):
+            return await sync_to_async(
+                self.get_read_response,
+                thread_sensitive=False,
+                executor=self.read_executor,
+            )(request)
+        return await sync_to_async(super().get_response)(request)
+
+
+def get_asgi_application():
+    django.setup(set_prefix=False)
+    return ReadPoolASGIHandler()
+
+
 application = get_asgi_application()
@@ -0,0 +1,89 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def read_from_replicas(enabled=True):
+    token = replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+
+def read_from_primary():
+    return read_from_replicas(False)
+
+
+def replica_aliases():
+    return settings.DATABASE_REPLICAS
+
+
+class PrimaryReplicaRouter:
+    """Чтение внутри read_from_replicas() идёт на реплики, остальное — на
+    основную базу."""
+
+    def db_for_read(self, model, **hints):
+        if replica_reads.get():
+            replicas = replica_aliases()
+            if replicas:
+                return random.choice(replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+def check_connections(**kwargs):
+    # постоянные соединения проверяются перед запросом: упавшее
+    # соединение закрывается, и Django откроет новое. Проверка — запрос
+    # к базе, поэтому не чаще раза в DB_HEALTH_CHECK_INTERVAL секунд
+    now = time.monotonic()
+    for conn in connections.all():
+        if (
+            not conn.settings_dict.get('HEALTH_CHECKS')
+            or conn.connection is None
+            or now - getattr(conn, 'health_checked_at', 0)
+            < settings.DB_HEALTH_CHECK_INTERVAL
+        ):
+            continue
+        conn.health_checked_at = now
+        if not conn.is_usable():
+            conn.close()
+
+
+def mark_connection_checked(sender, connection, **kwargs):
+    # только что открытое соединение проверять незачем
+    connection.health_checked_at = time.monotonic()
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    # WAL позволяет читать параллельно с записью, остальные настройки
+    # уменьшают число fsync и обращений к диску
+    if connection.vendor != 'sqlite':
+        return
+    # напрямую через sqlite3, чтобы служебные запросы не попадали в
+    # execute_wrapper'ы (профилировщик считал бы их запросами view)
+    for pragma, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {pragma} = {value}')
+
+
+def connect_signals():
+    request_started.connect(check_connections)
+    connection_created.connect(mark_connection_checked)
+    connection_created.connect(configure_sqlite)
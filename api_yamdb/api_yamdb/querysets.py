@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class ApiQuerySet(models.QuerySet):
+    """Выборка для сериализаторов API; fields ограничивает поля ответа."""
+    # поле ответа API -> поля модели, которые для него загружаются
+    API_FIELDS = {}
+    # поле ответа API -> связь, которая загружается тем же запросом
+    API_RELATED = {}
+    # поля, которые загружаются при любом наборе полей ответа
+    API_REQUIRED = ('id',)
+
+    def for_api(self, fields=None):
+        if fields is None:
+            fields = self.API_FIELDS
+        queryset = self.prefetch_for_api(fields)
+        related = [
+            path for field, path in self.API_RELATED.items()
+            if field in fields
+        ]
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*self.API_REQUIRED, *(
+            path
+            for field in fields
+            for path in self.API_FIELDS.get(field, ())
+        ))
+
+    def prefetch_for_api(self, fields):
+        return self
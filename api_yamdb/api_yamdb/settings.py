@@ -24,10 +24,10 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'reviews',
+    'reviews.apps.ReviewsConfig',
     'users',
-    'api',
-    'titcatgen',
+    'api.apps.ApiConfig',
+    'titcatgen.apps.TitcatgenConfig',
     'dotenv',
     'rest_framework',
     'rest_framework.authtoken',
@@ -42,6 +42,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.QueryProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -67,11 +68,77 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 
 # Database
+# По умолчанию SQLite; PostgreSQL и реплики включаются переменными окружения
 
-DATABASES = {
+DB_ENGINE = os.getenv('DB_ENGINE', 'django.db.backends.sqlite3')
+
+# псевдонимы баз, с которых читает api_yamdb.db.PrimaryReplicaRouter
+DATABASE_REPLICAS = []
+
+# соединения с HEALTH_CHECKS проверяются запросом не чаще раза в столько
+# секунд (api_yamdb.db.check_connections)
+DB_HEALTH_CHECK_INTERVAL = int(os.getenv('DB_HEALTH_CHECK_INTERVAL', 30))
+
+if DB_ENGINE == 'django.db.backends.sqlite3':
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME', 'yamdb'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            'HEALTH_CHECKS': os.getenv('DB_HEALTH_CHECKS', 'true') == 'true',
+            # пулер в режиме transaction (pgbouncer) не поддерживает
+            # серверные курсоры
+            'DISABLE_SERVER_SIDE_CURSORS': bool(os.getenv('DB_POOLER')),
+        }
+    }
+    replica_hosts = os.getenv('DB_REPLICA_HOSTS', '')
+    for number, host in enumerate(filter(None, replica_hosts.split(','))):
+        host, _, port = host.strip().partition(':')
+        alias = f'replica_{number}'
+        DATABASES[alias] = dict(
+            DATABASES['default'],
+            HOST=host,
+            PORT=port or DATABASES['default']['PORT'],
+            # в тестах реплика — зеркало тестовой базы
+            TEST={'MIRROR': 'default'},
+        )
+        DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['api_yamdb.db.PrimaryReplicaRouter']
+
+# PRAGMA для каждого нового соединения с SQLite (api_yamdb.db.configure_sqlite)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'cache_size': -64000,
+    'mmap_size': 268435456,
+    'busy_timeout': 5000,
+    'temp_store': 'memory',
+}
+
+
+# Cache
+
+# Версии кеша ответов и пользователей, счётчики ограничения частоты
+# общие для процессов, только если общий сам кеш (Memcached, Redis);
+# LocMemCache у каждого процесса свой
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
 
@@ -115,7 +182,7 @@ STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static/'),)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -123,13 +190,60 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS':
         'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
+    # orjson используется, если установлен; иначе стандартный json
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # корзина токенов: '10/min' — 10 запросов подряд и 10 новых за минуту
+    'DEFAULT_THROTTLE_CLASSES': (
+        'api.throttling.TokenBucketThrottle',
+    ),
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': '20/hour',
+        'token': '10/min',
+        'review-post': '30/hour',
+        'read': '1200/min',
+    },
 }
 
+# Байесовский рейтинг произведений (titcatgen.models.weighted_rating):
+# к оценкам добавляется PRIOR_COUNT оценок, равных PRIOR_MEAN. После
+# изменения значений нужен manage.py recalculate_ratings
+TITLE_RATING_PRIOR_MEAN = 6.0
+
+TITLE_RATING_PRIOR_COUNT = 5
+
+# Срок хранения ответов API в кеше (api.mixins.CachedResponseMixin).
+# Версии сбрасываются сигналами, а срок ограничивает устаревание, если
+# кеш не общий для процессов
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 60))
+
+# max-age ответов со списком и страницами произведений для анонимных
+# пользователей (Cache-Control для прокси и CDN)
+TITLE_CACHE_MAX_AGE = 60
+
+# Как часто корзина процесса сверяется с общим кешем (секунды)
+# и сколько корзин держать в памяти (api.throttling)
+THROTTLE_SYNC_INTERVAL = 1
+
+THROTTLE_LOCAL_SIZE = 10000
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Пользователь из токена кешируется в процессе и в общем кеше (секунды)
+AUTH_USER_CACHE_TIMEOUT = 60
+
+AUTH_USER_CACHE_LOCAL_SIZE = 1024
+
 EMAIL_HOST = 'gmail.com'
 
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
@@ -144,5 +258,39 @@ EMAIL_USE_SSL = False
 
 AUTH_USER_MODEL = 'users.User'
 
+# GET-запросы к этим представлениям под ASGI выполняются в отдельном
+# пуле потоков (см. api_yamdb/asgi.py)
+ASGI_READ_VIEWS = (
+    'api:titles-list',
+    'api:titles-detail',
+    'api:titles-top',
+    'api:review-list',
+    'api:review-detail',
+    'api:comments-list',
+    'api:comments-detail',
+)
+
+ASGI_READ_THREADS = int(os.getenv('ASGI_READ_THREADS', 8))
+
+# Бюджет SQL-запросов на один HTTP-запрос по имени URL, можно с методом
+# (api.middleware.QueryProfilerMiddleware)
+QUERY_BUDGETS = {
+    'GET api:titles-list': 4,
+    'GET api:titles-detail': 3,
+    'GET api:titles-stats': 2,
+    'GET api:titles-top': 3,
+    'GET api:categories-list': 3,
+    'GET api:genres-list': 3,
+    'GET api:review-list': 4,
+    'GET api:review-detail': 3,
+    'GET api:comments-list': 4,
+    'GET api:comments-detail': 3,
+    'GET api:users-list': 3,
+}
+
+QUERY_BUDGET_DEFAULT = None
+
+QUERY_BUDGET_RAISE = False
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
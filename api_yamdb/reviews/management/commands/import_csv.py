@@ -0,0 +1,270 @@
+import csv
+import os
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from api.authentication import user_version_name
+from api.cache import bump_title_versions, bump_version
+from reviews.models import Comment, Review
+from titcatgen.models import Category, Genre, Title
+from users.models import User
+
+# файлы загружаются в порядке зависимостей: сначала то, на что ссылаются
+CSV_FILES = (
+    ('users.csv', User, {}),
+    ('category.csv', Category, {}),
+    ('genre.csv', Genre, {}),
+    ('titles.csv', Title, {'category_id': Category}),
+    ('genre_title.csv', Title.genre.through, {
+        'title_id': Title,
+        'genre_id': Genre,
+    }),
+    ('review.csv', Review, {'title_id': Title, 'author_id': User}),
+    ('comments.csv', Comment, {'review_id': Review, 'author_id': User}),
+)
+
+
+def fields_with(model, flag):
+    return [
+        field for field in model._meta.concrete_fields
+        if getattr(field, flag, False)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов static/data в базу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Папка с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк, вставляемых одним запросом.',
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help='Обновлять уже существующие записи вместо пропуска.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только проверить файлы, ничего не записывая в базу.',
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.ids = {}
+        # записи, для которых сбрасываются версии кеша
+        self.changed = defaultdict(set)
+        imported_titles = False
+        imported_reviews = False
+        for filename, model, relations in CSV_FILES:
+            path = os.path.join(options['path'], filename)
+            if not os.path.exists(path):
+                self.stdout.write(
+                    self.style.WARNING(f'{filename}: файл не найден')
+                )
+                continue
+            try:
+                self.import_file(path, model, relations)
+            except IntegrityError as error:
+                raise CommandError(f'{filename}: {error}')
+            imported_titles = imported_titles or model is Title
+            imported_reviews = imported_reviews or model is Review
+        if options['dry_run']:
+            return
+        # bulk_create не вызывает сигналы, поэтому производные данные
+        # пересчитываются после загрузки
+        if imported_titles:
+            call_command('rebuild_search_index', stdout=self.stdout)
+        if imported_reviews:
+            call_command('recalculate_ratings', stdout=self.stdout)
+        self.bump_cache_versions()
+
+    def get_ids(self, model):
+        if model not in self.ids:
+            self.ids[model] = set(
+                model.objects.values_list('pk', flat=True).iterator()
+            )
+        return self.ids[model]
+
+    def clean_value(self, field, relations, value):
+        if value == '' and field.null:
+            return None
+        parent = relations.get(field.attname)
+        if parent is None:
+            # валидаторы модели: в базе их нарушение оборвало бы весь файл
+            return field.clean(value, None)
+        value = field.to_python(value)
+        if value not in self.get_ids(parent):
+            raise ValidationError('не найден')
+        return value
+
+    def build_object(self, model, fields, relations, row):
+        values = {}
+        errors = []
+        for field, value in zip(fields, row):
+            try:
+                values[field.attname] = self.clean_value(
+                    field, relations, value
+                )
+            except ValidationError as error:
+                errors.extend(
+                    f'{field.attname}={value} {message}'
+                    for message in error.messages
+                )
+        if errors:
+            raise ValidationError(errors)
+        obj = model(**values)
+        if model is User and not obj.password:
+            obj.set_unusable_password()
+        return obj
+
+    def parse_row(self, location, model, fields, relations, row):
+        try:
+            return self.build_object(model, fields, relations, row)
+        except ValidationError as error:
+            self.stderr.write(f'{location}: {"; ".join(error.messages)}')
+            return None
+
+    def save_batch(self, model, to_create, to_update, update_fields):
+        if self.options['dry_run']:
+            return
+        self.create_objects(model, to_create, update_fields)
+        if to_update:
+            # bulk_update не трогает auto_now, а по нему считаются ETag
+            now = timezone.now()
+            auto_now = [field.name for field in fields_with(model, 'auto_now')]
+            for obj in to_update:
+                for name in auto_now:
+                    setattr(obj, name, now)
+            model.objects.bulk_update(
+                to_update, [*update_fields, *auto_now],
+                batch_size=self.options['batch_size'],
+            )
+        self.remember_changed(model, to_create, to_update)
+
+    def create_objects(self, model, objs, csv_fields):
+        # размер пачки уже ограничен --batch-size; разбиение под
+        # лимиты бэкенда (SQLite) bulk_create сделает сам
+        csv_dates = [
+            field.attname for field in fields_with(model, 'auto_now_add')
+            if field.name in csv_fields
+        ]
+        dates = [[getattr(obj, name) for name in csv_dates] for obj in objs]
+        # bulk_create заменяет auto_now_add текущим временем и в самих
+        # объектах, поэтому даты из CSV записываются вторым запросом
+        model.objects.bulk_create(objs)
+        if not csv_dates or not objs:
+            return
+        for obj, values in zip(objs, dates):
+            for name, value in zip(csv_dates, values):
+                setattr(obj, name, value)
+        model.objects.bulk_update(objs, csv_dates)
+
+    def remember_changed(self, model, to_create, to_update):
+        if model is User:
+            # новые пользователи не могли попасть в кеш аутентификации
+            self.changed[User].update(obj.pk for obj in to_update)
+        elif model in (Title, Category, Genre):
+            self.changed[model].update(
+                obj.pk for obj in (*to_create, *to_update)
+            )
+        elif model in (Title.genre.through, Review):
+            self.changed[Title].update(
+                obj.title_id for obj in (*to_create, *to_update)
+            )
+
+    def bump_cache_versions(self):
+        # bulk_create и bulk_update не отправляют сигналы, которые
+        # сбрасывают кеш; все файлы к этому моменту уже закоммичены
+        for model in (Category, Genre):
+            if self.changed[model]:
+                bump_version(model._meta.label_lower)
+        if self.changed[Title]:
+            bump_title_versions(*self.changed[Title])
+        for pk in self.changed[User]:
+            bump_version(user_version_name(pk))
+
+    def import_file(self, path, model, relations):
+        filename = os.path.basename(path)
+        batch_size = self.options['batch_size']
+        dry_run = self.options['dry_run']
+        existing = self.get_ids(model)
+        started = time.monotonic()
+        counts = {'created': 0, 'updated': 0, 'skipped': 0}
+        to_create = []
+        to_update = []
+
+        def flush():
+            self.save_batch(model, to_create, to_update, update_fields)
+            counts['created'] += len(to_create)
+            counts['updated'] += len(to_update)
+            to_create.clear()
+            to_update.clear()
+            if self.options['verbosity'] > 1:
+                self.report(filename, counts, started)
+
+        with open(path, encoding='utf-8', newline='') as csv_file, \
+                transaction.atomic():
+            reader = csv.reader(csv_file)
+            header = next(reader)
+            fields = [model._meta.get_field(column) for column in header]
+            update_fields = [
+                field.name for field in fields if not field.primary_key
+            ]
+            for line, row in enumerate(reader, start=2):
+                obj = self.parse_row(
+                    f'{filename}:{line}', model, fields, relations, row
+                )
+                if obj is None:
+                    counts['skipped'] += 1
+                    continue
+                if obj.pk in existing:
+                    if not self.options['upsert']:
+                        counts['skipped'] += 1
+                        continue
+                    to_update.append(obj)
+                else:
+                    existing.add(obj.pk)
+                    to_create.append(obj)
+                if len(to_create) + len(to_update) >= batch_size:
+                    flush()
+            flush()
+            if not dry_run:
+                self.reset_sequences(model)
+        self.report(filename, counts, started, style=self.style.SUCCESS)
+
+    def reset_sequences(self, model):
+        statements = connection.ops.sequence_reset_sql(no_style(), [model])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def report(self, filename, counts, started, style=None):
+        elapsed = time.monotonic() - started
+        rows = sum(counts.values())
+        speed = rows / elapsed if elapsed else rows
+        message = (
+            f'{filename}: создано {counts["created"]}, '
+            f'обновлено {counts["updated"]}, '
+            f'пропущено {counts["skipped"]} '
+            f'за {elapsed:.2f} с ({speed:.0f} rows/s)'
+        )
+        if self.options['dry_run']:
+            message += ' [dry-run]'
+        self.stdout.write(style(message) if style else message)
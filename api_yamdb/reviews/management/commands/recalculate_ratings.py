@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import (Count, ExpressionWrapper, FloatField,
+                              IntegerField, OuterRef, Q, Subquery, Sum)
+from django.db.models.functions import Cast, Coalesce
+
+from reviews.models import (SCORE, Review, TitleRatingStats,
+                            histogram_field)
+from titcatgen.models import Title, weighted_rating
+
+
+def title_rating_values():
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    rating_sum = Subquery(
+        reviews.annotate(
+            total=Sum('score')
+        ).values('total'),
+        output_field=IntegerField(),
+    )
+    rating_count = Subquery(
+        reviews.annotate(total=Count('pk')).values('total'),
+        output_field=IntegerField(),
+    )
+    return {
+        'rating_sum': Coalesce(rating_sum, 0),
+        'rating_count': Coalesce(rating_count, 0),
+        'rating': ExpressionWrapper(
+            Cast(rating_sum, FloatField()) / rating_count,
+            output_field=FloatField(),
+        ),
+        # без отзывов подзапросы дают NULL, и рейтинг остаётся пустым
+        'weighted_rating': weighted_rating(rating_sum, rating_count),
+    }
+
+
+def rebuild_rating_stats(first_pk, last_pk):
+    TitleRatingStats.objects.filter(
+        title_id__gte=first_pk, title_id__lte=last_pk
+    ).delete()
+    rows = Review.objects.filter(
+        title_id__gte=first_pk, title_id__lte=last_pk
+    ).order_by().values('title_id').annotate(**{
+        histogram_field(score): Count('pk', filter=Q(score=score))
+        for score, _ in SCORE
+    })
+    TitleRatingStats.objects.bulk_create(
+        TitleRatingStats(**row) for row in rows
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинг и распределение оценок произведений '
+        'по отзывам.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Количество произведений, обновляемых одним запросом.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        values = title_rating_values()
+        last_pk = 0
+        updated = 0
+        while True:
+            pks = list(
+                Title.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            with transaction.atomic():
+                updated += Title.objects.filter(
+                    pk__gte=pks[0], pk__lte=pks[-1]
+                ).update(**values)
+                rebuild_rating_stats(pks[0], pks[-1])
+            last_pk = pks[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитан рейтинг произведений: {updated}')
+        )
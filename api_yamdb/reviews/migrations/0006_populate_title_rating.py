@@ -0,0 +1,44 @@
+from django.db import migrations
+from django.db.models import (Count, ExpressionWrapper, FloatField,
+                              IntegerField, OuterRef, Subquery, Sum)
+from django.db.models.functions import Cast, Coalesce
+
+
+def populate_title_rating(apps, schema_editor):
+    Title = apps.get_model('titcatgen', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    rating_sum = Subquery(
+        reviews.annotate(
+            total=Sum(Cast('score', IntegerField()))
+        ).values('total'),
+        output_field=IntegerField(),
+    )
+    rating_count = Subquery(
+        reviews.annotate(total=Count('pk')).values('total'),
+        output_field=IntegerField(),
+    )
+    Title.objects.update(
+        rating_sum=Coalesce(rating_sum, 0),
+        rating_count=Coalesce(rating_count, 0),
+        rating=ExpressionWrapper(
+            Cast(rating_sum, FloatField()) / rating_count,
+            output_field=FloatField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titcatgen', '0003_title_rating'),
+        ('reviews', '0005_auto_20220306_1010'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            populate_title_rating, migrations.RunPython.noop
+        ),
+    ]
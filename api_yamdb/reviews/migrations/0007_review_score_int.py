@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_populate_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='score_int',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, transaction
+from django.db.models import IntegerField, Max, Min
+from django.db.models.functions import Cast
+
+BATCH_SIZE = 10000
+
+
+def convert_scores(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    bounds = Review.objects.aggregate(first=Min('pk'), last=Max('pk'))
+    if bounds['first'] is None:
+        return
+    for start in range(bounds['first'], bounds['last'] + 1, BATCH_SIZE):
+        with transaction.atomic():
+            Review.objects.filter(
+                pk__gte=start, pk__lt=start + BATCH_SIZE
+            ).update(score_int=Cast('score', IntegerField()))
+
+
+class Migration(migrations.Migration):
+    # каждая пачка фиксируется отдельно, чтобы не держать таблицу целиком
+    atomic = False
+
+    dependencies = [
+        ('reviews', '0007_review_score_int'),
+    ]
+
+    operations = [
+        migrations.RunPython(convert_scores, migrations.RunPython.noop),
+    ]
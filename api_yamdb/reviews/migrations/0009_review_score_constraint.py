@@ -0,0 +1,35 @@
+from django.db import migrations, models
+import reviews.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titcatgen', '0003_title_rating'),
+        ('reviews', '0008_convert_review_score'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='review',
+            name='score',
+        ),
+        migrations.RenameField(
+            model_name='review',
+            old_name='score_int',
+            new_name='score',
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='score',
+            field=models.PositiveSmallIntegerField(choices=[(1, '1'), (2, '2'), (3, '3'), (4, '4'), (5, '5'), (6, '6'), (7, '7'), (8, '8'), (9, '9'), (10, '10')], validators=[reviews.validators.validate_score]),
+        ),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.CheckConstraint(check=models.Q(('score__gte', 1), ('score__lte', 10)), name='score_range'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'score'], name='review_title_score_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 3.0 on 2026-10-18 18:11
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def populate_rating_stats(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    TitleRatingStats = apps.get_model('reviews', 'TitleRatingStats')
+    rows = Review.objects.filter(
+        title__isnull=False
+    ).order_by().values('title_id').annotate(**{
+        f'score_{score}': Count('pk', filter=Q(score=score))
+        for score in range(1, 11)
+    })
+    TitleRatingStats.objects.bulk_create(
+        TitleRatingStats(**row) for row in rows.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titcatgen', '0005_title_indexes'),
+        ('reviews', '0010_review_comment_pub_date_order'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRatingStats',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_stats', serialize=False, to='titcatgen.Title')),
+                ('score_1', models.PositiveIntegerField(default=0)),
+                ('score_2', models.PositiveIntegerField(default=0)),
+                ('score_3', models.PositiveIntegerField(default=0)),
+                ('score_4', models.PositiveIntegerField(default=0)),
+                ('score_5', models.PositiveIntegerField(default=0)),
+                ('score_6', models.PositiveIntegerField(default=0)),
+                ('score_7', models.PositiveIntegerField(default=0)),
+                ('score_8', models.PositiveIntegerField(default=0)),
+                ('score_9', models.PositiveIntegerField(default=0)),
+                ('score_10', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(
+            populate_rating_stats, migrations.RunPython.noop
+        ),
+    ]
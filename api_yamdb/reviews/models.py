@@ -1,15 +1,55 @@
-from django.db import models
+from django.db import models, transaction
 
+from api_yamdb.querysets import ApiQuerySet
 from titcatgen.models import Title
 from users.models import User
-from .validators import validate_score
+from .validators import MAX_SCORE, MIN_SCORE, validate_score
 
-SCORE = [(i, str(i)) for i in range(1, 11)]
+SCORE = [(i, str(i)) for i in range(MIN_SCORE, MAX_SCORE + 1)]
+
+
+def histogram_field(score):
+    return f'score_{score}'
+
+
+HISTOGRAM_FIELDS = tuple(histogram_field(score) for score, _ in SCORE)
+
+
+class NestedApiQuerySet(ApiQuerySet):
+    """Выборка для сериализаторов вложенных ресурсов.
+
+    Родитель (произведение отзыва, отзыв комментария) приходит из
+    связанного менеджера, поэтому его поле загружается всегда, как и
+    updated_at для ETag и Last-Modified ответа.
+    """
+    API_RELATED = {'author': 'author'}
+
+
+class ReviewQuerySet(NestedApiQuerySet):
+    API_FIELDS = {
+        'id': ('id',),
+        'author': ('author__username',),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+        'text': ('text',),
+        'title': (),
+    }
+    API_REQUIRED = ('id', 'title', 'updated_at')
+
+
+class CommentQuerySet(NestedApiQuerySet):
+    API_FIELDS = {
+        'id': ('id',),
+        'author': ('author__username',),
+        'pub_date': ('pub_date',),
+        'text': ('text',),
+        'review': (),
+    }
+    API_REQUIRED = ('id', 'review', 'updated_at')
 
 
 class Review(models.Model):
-    score = models.CharField(
-        max_length=1,
+    score = models.PositiveSmallIntegerField(
         choices=SCORE,
         blank=False,
         null=False,
@@ -33,19 +73,51 @@ class Review(models.Model):
     pub_date = models.DateTimeField(
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    objects = ReviewQuerySet.as_manager()
 
     class Meta:
-        ordering = ('score',)
+        ordering = ('pub_date', 'id')
         constraints = (
             models.UniqueConstraint(
                 fields=('title', 'author'),
                 name='uniq_author',
             ),
+            models.CheckConstraint(
+                check=models.Q(score__gte=MIN_SCORE, score__lte=MAX_SCORE),
+                name='score_range',
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('title', 'score'),
+                name='review_title_score_idx',
+            ),
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx',
+            ),
         )
 
     def __str__(self):
         return f'{self.author} - {self.text[:15]}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # запоминаем оценку из БД, чтобы пересчитать рейтинг при удалении
+        if 'title_id' in instance.__dict__ and 'score' in instance.__dict__:
+            instance._rated_values = (instance.title_id, instance.score)
+        return instance
+
+    def save(self, *args, **kwargs):
+        # рейтинг произведения обновляется сигналами в той же транзакции
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -62,9 +134,96 @@ class Comment(models.Model):
     pub_date = models.DateTimeField(
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    objects = CommentQuerySet.as_manager()
 
     class Meta:
-        ordering = ('text', )
+        ordering = ('pub_date', 'id')
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx',
+            ),
+        )
 
     def __str__(self):
         return f'{self.author} - {self.text[:15]}'
+
+
+class TitleRatingStats(models.Model):
+    """Распределение оценок произведения, обновляется сигналами отзывов."""
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rating_stats',
+    )
+    score_1 = models.PositiveIntegerField(default=0)
+    score_2 = models.PositiveIntegerField(default=0)
+    score_3 = models.PositiveIntegerField(default=0)
+    score_4 = models.PositiveIntegerField(default=0)
+    score_5 = models.PositiveIntegerField(default=0)
+    score_6 = models.PositiveIntegerField(default=0)
+    score_7 = models.PositiveIntegerField(default=0)
+    score_8 = models.PositiveIntegerField(default=0)
+    score_9 = models.PositiveIntegerField(default=0)
+    score_10 = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.title_id}: {self.histogram}'
+
+    @classmethod
+    def for_title(cls, title):
+        # у произведения без отзывов строки статистики нет
+        try:
+            return title.rating_stats
+        except cls.DoesNotExist:
+            return cls(title=title)
+
+    @property
+    def histogram(self):
+        return {
+            score: getattr(self, histogram_field(score))
+            for score, _ in SCORE
+        }
+
+    @property
+    def count(self):
+        return sum(self.histogram.values())
+
+    @property
+    def mean(self):
+        count = self.count
+        if not count:
+            return None
+        return sum(
+            score * number for score, number in self.histogram.items()
+        ) / count
+
+    @property
+    def median(self):
+        count = self.count
+        if not count:
+            return None
+        # средний элемент (или пара элементов) отсортированных оценок
+        positions = ((count - 1) // 2, count // 2)
+        values = []
+        seen = 0
+        for score, number in self.histogram.items():
+            seen += number
+            while len(values) < 2 and positions[len(values)] < seen:
+                values.append(score)
+        return sum(values) / 2
+
+    @property
+    def stddev(self):
+        mean = self.mean
+        if mean is None:
+            return None
+        return (sum(
+            number * (score - mean) ** 2
+            for score, number in self.histogram.items()
+        ) / self.count) ** 0.5
@@ -0,0 +1,92 @@
+from collections import Counter
+
+from django.db.models import Case, ExpressionWrapper, F, FloatField, When
+from django.db.models.functions import Cast
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from titcatgen.models import Title, weighted_rating
+from .models import Review, TitleRatingStats, histogram_field
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    if title_id is None or not (score_delta or count_delta):
+        return
+    rating_sum = F('rating_sum') + score_delta
+    rating_count = F('rating_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=Case(
+            When(rating_count=-count_delta, then=None),
+            default=ExpressionWrapper(
+                Cast(rating_sum, FloatField()) / rating_count,
+                output_field=FloatField(),
+            ),
+            output_field=FloatField(),
+        ),
+        weighted_rating=Case(
+            When(rating_count=-count_delta, then=None),
+            default=weighted_rating(rating_sum, rating_count),
+            output_field=FloatField(),
+        ),
+    )
+
+
+def update_score_histogram(title_id, *changes):
+    """Сдвигает счётчики оценок; changes — пары (оценка, изменение)."""
+    deltas = Counter()
+    for score, delta in changes:
+        deltas[score] += delta
+    values = {
+        histogram_field(score): F(histogram_field(score)) + delta
+        for score, delta in deltas.items() if delta
+    }
+    if title_id is None or not values:
+        return
+    stats = TitleRatingStats.objects.filter(title_id=title_id)
+    if not stats.update(**values) and any(
+        delta > 0 for delta in deltas.values()
+    ):
+        # первая оценка произведения: строки статистики ещё нет
+        TitleRatingStats.objects.get_or_create(title_id=title_id)
+        stats.update(**values)
+
+
+@receiver(pre_save, sender=Review)
+def remember_rated_values(sender, instance, raw, using, **kwargs):
+    if raw or instance._state.adding:
+        return
+    # оценка из БД, а не из экземпляра, под блокировкой строки: параллельное
+    # изменение того же отзыва дождётся конца транзакции Review.save()
+    instance._rated_values = Review.objects.using(using).select_for_update(
+    ).filter(pk=instance.pk).values_list('title_id', 'score').first()
+
+
+@receiver(post_save, sender=Review)
+def apply_review_score(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_rated_values', None)
+    current = (instance.title_id, instance.score)
+    if previous is not None and previous[0] == current[0]:
+        update_title_rating(current[0], current[1] - previous[1], 0)
+        update_score_histogram(
+            current[0], (previous[1], -1), (current[1], 1)
+        )
+    else:
+        if previous is not None:
+            update_title_rating(previous[0], -previous[1], -1)
+            update_score_histogram(previous[0], (previous[1], -1))
+        update_title_rating(current[0], current[1], 1)
+        update_score_histogram(current[0], (current[1], 1))
+    instance._rated_values = current
+
+
+@receiver(post_delete, sender=Review)
+def revoke_review_score(sender, instance, **kwargs):
+    title_id, score = getattr(
+        instance, '_rated_values', (instance.title_id, instance.score)
+    )
+    update_title_rating(title_id, -score, -1)
+    update_score_histogram(title_id, (score, -1))
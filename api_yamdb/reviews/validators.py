@@ -1,7 +1,12 @@
-from django.core import validators
+from django.core.exceptions import ValidationError
+
+MIN_SCORE = 1
+MAX_SCORE = 10
 
 
 def validate_score(value):
-    if 0 > value > 10:
-        raise validators.BaseValidator('0-10')
-    return value
+    if not MIN_SCORE <= value <= MAX_SCORE:
+        raise ValidationError(
+            f'Оценка должна быть от {MIN_SCORE} до {MAX_SCORE}.',
+            params={'value': value},
+        )
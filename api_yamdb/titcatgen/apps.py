@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class TitcatgenConfig(AppConfig):
     name = 'titcatgen'
+
+    def ready(self):
+        from . import signals  # noqa: F401
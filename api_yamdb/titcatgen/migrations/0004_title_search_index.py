@@ -0,0 +1,51 @@
+from django.db import migrations
+
+SQLITE_FORWARD = (
+    "CREATE VIRTUAL TABLE titcatgen_title_fts USING fts5("
+    "name, description, tokenize='unicode61')",
+    "INSERT INTO titcatgen_title_fts (rowid, name, description) "
+    "SELECT id, name, description FROM titcatgen_title",
+)
+SQLITE_BACKWARD = (
+    'DROP TABLE IF EXISTS titcatgen_title_fts',
+)
+POSTGRES_FORWARD = (
+    "ALTER TABLE titcatgen_title ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+    ") STORED",
+    'CREATE INDEX titcatgen_title_search_idx '
+    'ON titcatgen_title USING GIN (search_vector)',
+)
+POSTGRES_BACKWARD = (
+    'DROP INDEX IF EXISTS titcatgen_title_search_idx',
+    'ALTER TABLE titcatgen_title DROP COLUMN IF EXISTS search_vector',
+)
+
+
+def run_statements(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titcatgen', '0003_title_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_statements({
+                'sqlite': SQLITE_FORWARD,
+                'postgresql': POSTGRES_FORWARD,
+            }),
+            run_statements({
+                'sqlite': SQLITE_BACKWARD,
+                'postgresql': POSTGRES_BACKWARD,
+            }),
+        ),
+    ]
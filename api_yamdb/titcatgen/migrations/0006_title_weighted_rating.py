@@ -0,0 +1,52 @@
+# Generated by Django 3.0 on 2026-10-18 18:33
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+
+def populate_weighted_rating(apps, schema_editor):
+    Title = apps.get_model('titcatgen', 'Title')
+    prior_count = settings.TITLE_RATING_PRIOR_COUNT
+    Title.objects.filter(rating_count__gt=0).update(
+        weighted_rating=(
+            Cast('rating_sum', FloatField())
+            + prior_count * settings.TITLE_RATING_PRIOR_MEAN
+        ) / (F('rating_count') + prior_count)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titcatgen', '0005_title_indexes'),
+        ('reviews', '0006_populate_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['weighted_rating', 'id'], name='title_weighted_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'weighted_rating', 'id'], name='title_category_weighted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating_count', 'id'], name='title_rating_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'rating_count', 'id'], name='title_category_count_idx'),
+        ),
+        migrations.RunPython(
+            populate_weighted_rating, migrations.RunPython.noop
+        ),
+    ]
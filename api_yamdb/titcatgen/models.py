@@ -1,5 +1,10 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import ExpressionWrapper, FloatField
+from django.db.models.functions import Cast
 
+from api_yamdb.querysets import ApiQuerySet
+from .search import index_titles
 from .validators import max_value_this_year, min_value_first_year
 
 
@@ -25,6 +30,82 @@ class Genre(models.Model):
         return self.slug
 
 
+def weighted_rating(rating_sum, rating_count):
+    """Байесовский рейтинг по выражениям суммы и числа оценок.
+
+    К оценкам произведения добавляются TITLE_RATING_PRIOR_COUNT оценок,
+    равных TITLE_RATING_PRIOR_MEAN, поэтому рейтинг по нескольким отзывам
+    не поднимается выше рейтинга по сотням.
+    """
+    prior_count = settings.TITLE_RATING_PRIOR_COUNT
+    return ExpressionWrapper(
+        (Cast(rating_sum, FloatField())
+         + prior_count * settings.TITLE_RATING_PRIOR_MEAN)
+        / (rating_count + prior_count),
+        output_field=FloatField(),
+    )
+
+
+class TitleQuerySet(ApiQuerySet):
+    API_FIELDS = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'description': ('description',),
+        'rating': ('rating',),
+        'category': ('category__name', 'category__slug'),
+        'genre': (),
+        'weighted_rating': ('weighted_rating',),
+        'reviews_count': ('rating_count',),
+    }
+    API_RELATED = {'category': 'category'}
+    # порядок рейтингов совпадает с индексами title_*_idx по этим полям
+    TOP_ORDERINGS = {
+        'rating': ('-weighted_rating', '-id'),
+        'reviews': ('-rating_count', '-id'),
+    }
+
+    def prefetch_for_api(self, fields):
+        if 'genre' not in fields:
+            return self
+        return self.prefetch_related(models.Prefetch(
+            'genre', queryset=Genre.objects.only('id', 'name', 'slug'),
+        ))
+
+    def top(self, by):
+        """Произведения с отзывами по убыванию рейтинга или числа отзывов."""
+        if by == 'rating':
+            queryset = self.filter(weighted_rating__isnull=False)
+        else:
+            queryset = self.filter(rating_count__gt=0)
+        return queryset.order_by(*self.TOP_ORDERINGS[by])
+
+    def bulk_create_with_genres(self, titles, genre_ids):
+        """Создаёт произведения и их связи с жанрами пачками.
+
+        genre_ids — множества id жанров в том же порядке, что и titles.
+        """
+        with transaction.atomic(using=self.db):
+            titles = self.bulk_create(titles)
+            if titles and titles[0].pk is None:
+                # бэкенд не вернул id (SQLite в Django 3.0); запись в
+                # транзакции заблокирована, так что новые id идут подряд
+                # и являются последними в таблице
+                pks = list(self.order_by('-pk').values_list(
+                    'pk', flat=True
+                )[:len(titles)])
+                for title, pk in zip(titles, reversed(pks)):
+                    title.pk = pk
+            through = self.model.genre.through
+            through.objects.using(self.db).bulk_create(
+                through(title_id=title.pk, genre_id=genre_id)
+                for title, genres in zip(titles, genre_ids)
+                for genre_id in genres
+            )
+            index_titles(titles)
+        return titles
+
+
 class Title(models.Model):
     name = models.CharField(max_length=200)
     year = models.PositiveSmallIntegerField(
@@ -46,9 +127,71 @@ class Title(models.Model):
         blank=True,
     )
     description = models.TextField(blank=True,)
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    rating = models.FloatField(
+        blank=True,
+        null=True,
+        editable=False,
+    )
+    weighted_rating = models.FloatField(
+        blank=True,
+        null=True,
+        editable=False,
+    )
+
+    objects = TitleQuerySet.as_manager()
+
+    # счётчики меняют только сигналы отзывов через F(); обычное сохранение
+    # загруженного ранее экземпляра затёрло бы их устаревшими значениями
+    COUNTER_FIELDS = frozenset(
+        ('rating_sum', 'rating_count', 'rating', 'weighted_rating')
+    )
 
     class Meta:
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=('name',), name='title_name_idx'),
+            models.Index(
+                fields=('category', 'name'), name='title_category_name_idx'
+            ),
+            models.Index(fields=('year', 'name'), name='title_year_name_idx'),
+            models.Index(
+                fields=('weighted_rating', 'id'),
+                name='title_weighted_rating_idx',
+            ),
+            models.Index(
+                fields=('category', 'weighted_rating', 'id'),
+                name='title_category_weighted_idx',
+            ),
+            models.Index(
+                fields=('rating_count', 'id'), name='title_rating_count_idx'
+            ),
+            models.Index(
+                fields=('category', 'rating_count', 'id'),
+                name='title_category_count_idx',
+            ),
+        )
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if not self._state.adding:
+            if update_fields is None:
+                deferred = self.get_deferred_fields()
+                update_fields = [
+                    field.attname for field in self._meta.concrete_fields
+                    if not field.primary_key and field.attname not in deferred
+                ]
+            update_fields = [
+                name for name in update_fields
+                if name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, update_fields=update_fields, **kwargs)
@@ -0,0 +1,85 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'titcatgen_title_fts'
+# вес названия выше веса описания
+SQLITE_RANK = f'bm25({FTS_TABLE}, 10.0, 1.0)'
+POSTGRES_CONFIG = 'russian'
+POSTGRES_QUERY = f"plainto_tsquery('{POSTGRES_CONFIG}', %s)"
+
+WORD = re.compile(r'\w+')
+
+
+def sqlite_match_query(query):
+    # каждое слово в кавычках, чтобы пользовательский ввод не ломал
+    # синтаксис FTS5, и с * для поиска по префиксу
+    return ' '.join(f'"{word}"*' for word in WORD.findall(query))
+
+
+def search_titles(queryset, query):
+    vendor = connection.vendor
+    if vendor == 'sqlite':
+        match = sqlite_match_query(query)
+        if not match:
+            return queryset.none()
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match,),
+        )).annotate(search_rank=RawSQL(
+            f'SELECT {SQLITE_RANK} FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s '
+            f'AND rowid = titcatgen_title.id',
+            (match,),
+        )).order_by('search_rank', 'pk')
+    if vendor == 'postgresql':
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT id FROM titcatgen_title '
+            f'WHERE search_vector @@ {POSTGRES_QUERY}',
+            (query,),
+        )).annotate(search_rank=RawSQL(
+            f'-ts_rank(titcatgen_title.search_vector, {POSTGRES_QUERY})',
+            (query,),
+        )).order_by('search_rank', 'pk')
+    return queryset.filter(
+        Q(name__icontains=query) | Q(description__icontains=query)
+    )
+
+
+def index_title(title):
+    index_titles([title])
+
+
+def index_titles(titles):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT OR REPLACE INTO {FTS_TABLE} (rowid, name, description) '
+            f'VALUES (%s, %s, %s)',
+            [(title.pk, title.name, title.description) for title in titles],
+        )
+
+
+def unindex_title(pk):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', (pk,))
+
+
+def rebuild_index():
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+                f'SELECT id, name, description FROM titcatgen_title'
+            )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')"
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute('REINDEX INDEX titcatgen_title_search_idx')
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Title
+from .search import index_title, unindex_title
+
+
+@receiver(post_save, sender=Title)
+def update_search_index(sender, instance, raw, **kwargs):
+    index_title(instance)
+
+
+@receiver(post_delete, sender=Title)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_title(instance.pk)
@@ -0,0 +1,113 @@
+import time
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import EmailOutbox
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из EmailOutbox пачками через одно соединение.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Количество писем, отправляемых за один проход.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=5,
+            help='После стольких неудач письмо больше не отправляется.',
+        )
+        parser.add_argument(
+            '--retry-delay',
+            type=float,
+            default=30,
+            help='Базовая задержка повтора в секундах, удваивается.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить накопившиеся письма и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        while True:
+            sent = self.send_batch()
+            if sent:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+
+    def pending(self):
+        return EmailOutbox.objects.filter(
+            sent_at__isnull=True,
+            next_attempt_at__lte=timezone.now(),
+            attempts__lt=self.options['max_attempts'],
+        ).order_by('next_attempt_at')
+
+    def send_batch(self):
+        with transaction.atomic():
+            emails = list(
+                self.pending().select_for_update(skip_locked=True)
+                [:self.options['batch_size']]
+            )
+            if not emails:
+                return 0
+            connection = get_connection()
+            try:
+                connection.open()
+            except Exception as error:
+                for email in emails:
+                    self.fail(email, error)
+            else:
+                try:
+                    for email in emails:
+                        self.send(connection, email)
+                finally:
+                    connection.close()
+            EmailOutbox.objects.bulk_update(
+                emails,
+                ('attempts', 'next_attempt_at', 'sent_at', 'last_error'),
+            )
+        sent = sum(email.sent_at is not None for email in emails)
+        if self.options['verbosity'] > 1:
+            self.stdout.write(f'Отправлено {sent} из {len(emails)}')
+        return len(emails)
+
+    def send(self, connection, email):
+        message = EmailMessage(
+            subject=email.subject,
+            body=email.body,
+            to=[email.to_email],
+            connection=connection,
+        )
+        try:
+            connection.send_messages([message])
+        except Exception as error:
+            self.fail(email, error)
+        else:
+            email.attempts += 1
+            email.sent_at = timezone.now()
+            email.last_error = ''
+
+    def fail(self, email, error):
+        email.attempts += 1
+        delay = self.options['retry_delay'] * 2 ** (email.attempts - 1)
+        email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        email.last_error = str(error)
+        self.stderr.write(f'{email.to_email}: {error}')
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 from .validators import validate_username
 
@@ -65,3 +66,40 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+
+class EmailOutbox(models.Model):
+    to_email = models.EmailField()
+    subject = models.CharField(
+        max_length=255,
+        blank=True,
+    )
+    body = models.TextField()
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+    )
+    sent_at = models.DateTimeField(
+        blank=True,
+        null=True,
+    )
+    last_error = models.TextField(
+        blank=True,
+    )
+
+    class Meta:
+        ordering = ('next_attempt_at',)
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'next_attempt_at'),
+                name='outbox_pending_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.to_email} - {self.subject or self.body[:15]}'
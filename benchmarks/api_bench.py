@@ -0,0 +1,221 @@
+"""Нагрузочный прогон эндпоинтов /api/v1 внутри процесса.
+
+Анонимные списки и страницы произведений, категории и жанры отдаются из
+кеша; путь через БД измеряют случаи с суффиксом «user» (авторизованные
+запросы кеш ответов не используют) и прогон с --cold-cache, который
+очищает кеши перед каждым запросом.
+
+Пример:
+    python benchmarks/api_bench.py --titles 2000 --iterations 200
+    python benchmarks/api_bench.py --titles 2000 --cold-cache
+    python benchmarks/api_bench.py --compare benchmarks/results/api-....json
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common  # noqa: E402
+
+BULK_SIZE = 20
+
+
+def make_clients():
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from users.models import RoleUser, User
+
+    admin = User.objects.filter(role=RoleUser.ADMIN).first()
+    user = User.objects.filter(role=RoleUser.USER).first()
+    clients = {'anon': APIClient()}
+    for name, account in (('admin', admin), ('user', user)):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(account)}'
+        )
+        clients[name] = client
+    return clients, user
+
+
+def build_cases(user):
+    from reviews.models import Comment
+
+    comment = Comment.objects.select_related('review').first()
+    review = comment.review
+    title = review.title_id
+    reviews = f'/api/v1/titles/{title}/reviews/'
+    comments = f'{reviews}{review.pk}/comments/'
+    counter = itertools.count()
+    return [
+        ('GET titles-list', 'anon', 'get', '/api/v1/titles/', None),
+        ('GET titles-list page 5', 'anon', 'get',
+         '/api/v1/titles/?page=5', None),
+        ('GET titles-list filtered', 'anon', 'get',
+         '/api/v1/titles/?genre=genre-1&category=category-1', None),
+        ('GET titles-list search', 'anon', 'get',
+         '/api/v1/titles/?q=произведение', None),
+        ('GET titles-detail', 'anon', 'get', f'/api/v1/titles/{title}/', None),
+        ('GET titles-list user', 'user', 'get', '/api/v1/titles/', None),
+        ('GET titles-list filtered user', 'user', 'get',
+         '/api/v1/titles/?genre=genre-1&category=category-1', None),
+        ('GET titles-detail user', 'user', 'get',
+         f'/api/v1/titles/{title}/', None),
+        ('GET titles-top', 'anon', 'get', '/api/v1/titles/top/', None),
+        ('GET titles-top user', 'user', 'get', '/api/v1/titles/top/', None),
+        ('GET titles-stats', 'anon', 'get',
+         f'/api/v1/titles/{title}/stats/', None),
+        ('GET titles-export', 'admin', 'get',
+         '/api/v1/titles/export/', None),
+        ('GET titles-export-reviews', 'admin', 'get',
+         '/api/v1/titles/reviews/export/', None),
+        ('GET titles-export-comments', 'admin', 'get',
+         '/api/v1/titles/comments/export/', None),
+        ('GET categories-list', 'anon', 'get', '/api/v1/categories/', None),
+        ('GET genres-list', 'anon', 'get', '/api/v1/genres/', None),
+        ('GET review-list', 'anon', 'get', reviews, None),
+        ('GET review-list cursor', 'anon', 'get', f'{reviews}?cursor=', None),
+        ('GET review-detail', 'anon', 'get', f'{reviews}{review.pk}/', None),
+        ('GET comments-list', 'anon', 'get', comments, None),
+        ('GET comments-detail', 'anon', 'get',
+         f'{comments}{comment.pk}/', None),
+        ('GET users-list', 'admin', 'get', '/api/v1/users/', None),
+        ('GET users-detail', 'admin', 'get',
+         f'/api/v1/users/{user.username}/', None),
+        ('GET users-me', 'user', 'get', '/api/v1/users/me/', None),
+        ('PATCH review-detail', 'admin', 'patch',
+         f'{reviews}{review.pk}/', lambda: {'text': 'Обновлённый отзыв'}),
+        ('POST comments-list', 'user', 'post', comments,
+         lambda: {'text': 'Комментарий из бенчмарка'}),
+        ('POST titles-bulk', 'admin', 'post', '/api/v1/titles/bulk/',
+         lambda: [
+             {
+                 'name': f'Произведение из бенчмарка {next(counter)}',
+                 'year': 2000,
+                 'category': 'category-1',
+                 'genre': ['genre-1', 'genre-2'],
+             }
+             for _ in range(BULK_SIZE)
+         ]),
+        ('POST auth-signup', 'anon', 'post', '/api/v1/auth/signup/',
+         lambda: {
+             'username': f'bench{next(counter)}',
+             'email': f'bench{next(counter)}@yamdb.fake',
+         }),
+        ('POST auth-token', 'anon', 'post', '/api/v1/auth/token/',
+         lambda: {
+             'username': user.username,
+             'confirmation_code': user.confirmation_code,
+         }),
+    ]
+
+
+def request(client, method, url, data):
+    payload = data() if data else None
+    # список (массовая загрузка) отправляется только как JSON
+    response = getattr(client, method)(
+        url, data=payload,
+        format='json' if isinstance(payload, list) else None,
+    )
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
+
+
+def clear_caches():
+    from django.core.cache import cache
+
+    from api.authentication import local_users
+    from api.throttling import local_buckets
+
+    cache.clear()
+    local_users.clear()
+    local_buckets.clear()
+
+
+def count_queries(client, method, url, data, options):
+    # отдельный запрос вне замеров: CaptureQueriesContext замедляет курсор,
+    # а у потоковых ответов нет заголовка X-DB-Queries
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    if options.cold_cache:
+        clear_caches()
+    with CaptureQueriesContext(connection) as context:
+        request(client, method, url, data)
+    return len(context)
+
+
+def run_case(client, method, url, data, options):
+    for _ in range(options.warmup):
+        request(client, method, url, data)
+    samples = []
+    status = None
+    for _ in range(options.iterations):
+        if options.cold_cache:
+            clear_caches()
+        started = time.perf_counter()
+        response = request(client, method, url, data)
+        samples.append((time.perf_counter() - started) * 1000)
+        status = response.status_code
+    result = {
+        'url': url,
+        'status': status,
+        'mean_ms': sum(samples) / len(samples),
+        'queries': count_queries(client, method, url, data, options),
+        'rss_kb': common.rss_kb(),
+    }
+    result.update({
+        f'{name}_ms': value
+        for name, value in common.percentiles(samples).items()
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    common.add_size_arguments(parser)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument(
+        '--cold-cache', action='store_true',
+        help='Очищать кеши перед каждым запросом.',
+    )
+    parser.add_argument('--output', help='Файл для результатов JSON.')
+    parser.add_argument('--compare', help='Результаты прошлого прогона.')
+    options = parser.parse_args()
+
+    common.setup_django()
+    old_name = common.create_database()
+    try:
+        started = time.perf_counter()
+        common.seed(options)
+        print(f'Данные созданы за {time.perf_counter() - started:.1f} с')
+        clients, user = make_clients()
+        results = {
+            'meta': common.metadata('api', options),
+            'cases': {},
+        }
+        print(f'{"case":45} {"p50":>8} {"p95":>8} {"p99":>8} {"sql":>4}')
+        for name, client, method, url, data in build_cases(user):
+            result = run_case(clients[client], method, url, data, options)
+            results['cases'][name] = result
+            print(
+                f'{name:45} {result["p50_ms"]:8.2f} {result["p95_ms"]:8.2f} '
+                f'{result["p99_ms"]:8.2f} {result["queries"]:4} '
+                f'[{result["status"]}]'
+            )
+        print(f'\nRSS: {common.rss_kb()} KB')
+        path = common.write_results('api', results, options.output)
+        print(f'Результаты: {path}')
+        if options.compare:
+            common.compare(results, options.compare)
+    finally:
+        common.destroy_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
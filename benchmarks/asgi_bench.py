@@ -0,0 +1,160 @@
+"""Конкурентные чтения через ASGI: стандартный ASGIHandler Django против
+ReadPoolASGIHandler из api_yamdb/asgi.py.
+
+ASGI-приложение вызывается напрямую из цикла asyncio (без сети), как это
+делает ASGI-сервер. --db-latency-ms добавляет задержку к каждому SQL-запросу,
+чтобы смоделировать базу на другом хосте.
+
+Пример:
+    python benchmarks/asgi_bench.py --concurrency 1 8 32 --requests 400
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common  # noqa: E402
+
+
+def add_db_latency(seconds):
+    from django.db.backends.signals import connection_created
+
+    def slow_execute(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def add_latency(sender, connection, **kwargs):
+        # в начало списка: execute_wrapper() профилировщика снимает
+        # последний элемент
+        connection.execute_wrappers.insert(0, slow_execute)
+
+    connection_created.connect(add_latency, weak=False)
+
+
+def build_paths():
+    from reviews.models import Comment
+
+    comment = Comment.objects.select_related('review').first()
+    reviews = f'/api/v1/titles/{comment.review.title_id}/reviews/'
+    return [
+        '/api/v1/titles/',
+        f'/api/v1/titles/{comment.review.title_id}/',
+        reviews,
+        f'{reviews}{comment.review_id}/comments/',
+    ]
+
+
+async def asgi_get(application, path):
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'',
+        'headers': [(b'host', b'testserver')],
+    }
+    status = None
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, receive, send)
+    return status
+
+
+async def run_load(application, paths, concurrency, total):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(path):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            status = await asgi_get(application, path)
+            latencies.append(time.perf_counter() - started)
+            errors += status != 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        one(paths[number % len(paths)]) for number in range(total)
+    ))
+    return time.perf_counter() - started, latencies, errors
+
+
+def run_case(application, paths, concurrency, options):
+    asyncio.run(run_load(application, paths, concurrency, options.warmup))
+    elapsed, latencies, errors = asyncio.run(
+        run_load(application, paths, concurrency, options.requests)
+    )
+    result = {
+        'concurrency': concurrency,
+        'requests_per_s': options.requests / elapsed,
+        'errors': errors,
+    }
+    result.update({
+        f'{name}_ms': value * 1000
+        for name, value in common.percentiles(latencies).items()
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    common.add_size_arguments(parser)
+    parser.set_defaults(titles=200, reviews_per_title=5)
+    parser.add_argument(
+        '--concurrency', type=int, nargs='+', default=[1, 8, 32]
+    )
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--db-latency-ms', type=float, default=2)
+    parser.add_argument('--output', help='Файл для результатов JSON.')
+    parser.add_argument('--compare', help='Результаты прошлого прогона.')
+    options = parser.parse_args()
+
+    common.setup_django()
+    old_name = common.create_database()
+    try:
+        common.seed(options)
+        paths = build_paths()
+        add_db_latency(options.db_latency_ms / 1000)
+
+        from django.core.handlers.asgi import ASGIHandler
+
+        from api_yamdb.asgi import ReadPoolASGIHandler
+
+        handlers = {
+            'django': ASGIHandler(),
+            'read-pool': ReadPoolASGIHandler(),
+        }
+        results = {
+            'meta': common.metadata('asgi', options),
+            'cases': {},
+        }
+        print(f'{"case":25} {"req/s":>9} {"p50":>8} {"p95":>8} {"err":>4}')
+        for name, application in handlers.items():
+            for concurrency in options.concurrency:
+                result = run_case(application, paths, concurrency, options)
+                case = f'{name} c={concurrency}'
+                results['cases'][case] = result
+                print(
+                    f'{case:25} {result["requests_per_s"]:9.1f} '
+                    f'{result["p50_ms"]:8.2f} {result["p95_ms"]:8.2f} '
+                    f'{result["errors"]:4}'
+                )
+        handlers['read-pool'].read_executor.shutdown()
+        path = common.write_results('asgi', results, options.output)
+        print(f'Результаты: {path}')
+        if options.compare:
+            common.compare(results, options.compare)
+    finally:
+        common.destroy_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
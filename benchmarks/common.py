@@ -0,0 +1,184 @@
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+from datetime import datetime
+from io import StringIO
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(BASE_DIR, 'api_yamdb')
+RESULTS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'results'
+)
+
+
+def setup_django():
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    import django
+    django.setup()
+    from django.conf import settings
+    # бенчмарки шлют тысячи запросов от одного клиента
+    rates = settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+    rates.update(dict.fromkeys(rates))
+
+
+def create_database(test_name=None):
+    """Создаёт отдельную тестовую базу с применёнными миграциями.
+
+    Для SQLite без test_name база создаётся в памяти.
+    """
+    from django.db import connection
+    old_name = connection.settings_dict['NAME']
+    if test_name is not None:
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = test_name
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    return old_name
+
+
+def destroy_database(old_name):
+    from django.db import connection
+    connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def add_size_arguments(parser):
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--categories', type=int, default=10)
+    parser.add_argument('--genres', type=int, default=20)
+    parser.add_argument('--titles', type=int, default=500)
+    parser.add_argument('--reviews-per-title', type=int, default=20)
+    parser.add_argument('--comments-per-review', type=int, default=2)
+    parser.add_argument('--genres-per-title', type=int, default=2)
+
+
+def seed(options):
+    """Заполняет базу синтетическими данными через модели проекта."""
+    from django.core.management import call_command
+    from django.db import transaction
+
+    from reviews.models import Comment, Review
+    from titcatgen.models import Category, Genre, Title
+    from users.models import RoleUser, User
+
+    reviews_per_title = min(options.reviews_per_title, options.users)
+    with transaction.atomic():
+        User.objects.bulk_create((
+            User(
+                username=f'user{i}',
+                email=f'user{i}@yamdb.fake',
+                role=RoleUser.ADMIN if i == 0 else RoleUser.USER,
+                password='!',
+            )
+            for i in range(options.users)
+        ))
+        Category.objects.bulk_create((
+            Category(name=f'Категория {i}', slug=f'category-{i}')
+            for i in range(options.categories)
+        ))
+        Genre.objects.bulk_create((
+            Genre(name=f'Жанр {i}', slug=f'genre-{i}')
+            for i in range(options.genres)
+        ))
+        users = list(User.objects.values_list('pk', flat=True))
+        categories = list(Category.objects.values_list('pk', flat=True))
+        genres = list(Genre.objects.values_list('pk', flat=True))
+        Title.objects.bulk_create((
+            Title(
+                name=f'Произведение {i}',
+                year=1900 + i % 120,
+                category_id=categories[i % len(categories)],
+                description=f'Описание произведения номер {i}',
+            )
+            for i in range(options.titles)
+        ))
+        titles = list(Title.objects.values_list('pk', flat=True))
+        Title.genre.through.objects.bulk_create((
+            Title.genre.through(
+                title_id=title, genre_id=genres[(i + j) % len(genres)]
+            )
+            for i, title in enumerate(titles)
+            for j in range(min(options.genres_per_title, len(genres)))
+        ))
+        Review.objects.bulk_create((
+            Review(
+                title_id=title,
+                author_id=users[j],
+                score=(i + j) % 10 + 1,
+                text=f'Отзыв {j} на произведение {title}',
+            )
+            for i, title in enumerate(titles)
+            for j in range(reviews_per_title)
+        ))
+        reviews = Review.objects.values_list('pk', flat=True).iterator()
+        Comment.objects.bulk_create((
+            Comment(
+                review_id=review,
+                author_id=users[j % len(users)],
+                text=f'Комментарий {j}',
+            )
+            for review in reviews
+            for j in range(options.comments_per_review)
+        ))
+    call_command('rebuild_search_index', verbosity=0, stdout=StringIO())
+    call_command('recalculate_ratings', stdout=open(os.devnull, 'w'))
+
+
+def percentiles(samples):
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {'p50': value, 'p95': value, 'p99': value}
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'p50': cuts[49], 'p95': cuts[94], 'p99': cuts[98]}
+
+
+def rss_kb():
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def metadata(name, options):
+    import django
+    from django.db import connection
+    return {
+        'benchmark': name,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'options': vars(options),
+    }
+
+
+def write_results(name, results, output=None):
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(RESULTS_DIR, f'{name}-{stamp}.json')
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+    return output
+
+
+def compare(results, baseline_path, metrics=('p50_ms', 'p95_ms')):
+    """Печатает изменение метрик относительно сохранённого прогона."""
+    with open(baseline_path, encoding='utf-8') as file:
+        baseline = json.load(file)
+    print(f'\nСравнение с {baseline_path}:')
+    for case, current in results['cases'].items():
+        previous = baseline['cases'].get(case)
+        if previous is None:
+            continue
+        changes = []
+        for metric in metrics:
+            if not previous.get(metric):
+                continue
+            delta = (current[metric] - previous[metric]) / previous[metric]
+            changes.append(f'{metric} {delta:+.1%}')
+        print(f'  {case:45} {", ".join(changes)}')
@@ -0,0 +1,128 @@
+"""Процессорное время на страницу списка: сериализаторы DRF против
+быстрого пути из .values() и стандартный json против orjson.
+
+Пример:
+    python benchmarks/render_bench.py --titles 500 --iterations 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common  # noqa: E402
+
+
+def build_modes():
+    from rest_framework.renderers import JSONRenderer
+
+    from api.renderers import FastJSONRenderer, orjson
+
+    modes = {
+        'drf': (False, JSONRenderer),
+        'lean': (True, JSONRenderer),
+    }
+    if orjson is not None:
+        modes['lean+orjson'] = (True, FastJSONRenderer)
+    return modes
+
+
+def configure(lean, renderer):
+    from api import serializers, views
+
+    lean_classes = {
+        views.TitleViewSet: serializers.LeanTitleSerializer,
+        views.ReviewViewSet: serializers.LeanReviewSerializer,
+    }
+    for viewset, lean_class in lean_classes.items():
+        viewset.lean_serializer_class = lean_class if lean else None
+        viewset.renderer_classes = (renderer,)
+
+
+def build_cases():
+    from reviews.models import Review
+
+    title = Review.objects.values_list('title_id', flat=True).first()
+    reviews = f'/api/v1/titles/{title}/reviews/'
+    return [
+        ('titles page', '/api/v1/titles/'),
+        ('titles page fields', '/api/v1/titles/?fields=id,name,rating'),
+        ('reviews page 10', f'{reviews}?limit=10'),
+        ('reviews page 100', f'{reviews}?limit=100'),
+    ]
+
+
+def run_case(client, url, options):
+    for _ in range(options.warmup):
+        client.get(url)
+    samples = []
+    size = 0
+    for _ in range(options.iterations):
+        started = time.process_time()
+        response = client.get(url)
+        samples.append((time.process_time() - started) * 1000)
+        size = len(response.content)
+    result = {
+        'url': url,
+        'status': response.status_code,
+        'bytes': size,
+        'cpu_mean_ms': sum(samples) / len(samples),
+    }
+    result.update({
+        f'cpu_{name}_ms': value
+        for name, value in common.percentiles(samples).items()
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    common.add_size_arguments(parser)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--output', help='Файл для результатов JSON.')
+    parser.add_argument('--compare', help='Результаты прошлого прогона.')
+    options = parser.parse_args()
+
+    common.setup_django()
+    old_name = common.create_database()
+    try:
+        common.seed(options)
+        from rest_framework.test import APIClient
+        client = APIClient()
+        cases = build_cases()
+        results = {
+            'meta': common.metadata('render', options),
+            'cases': {},
+        }
+        print(f'{"case":40} {"cpu p50":>8} {"cpu mean":>9} {"bytes":>7}')
+        for mode, (lean, renderer) in build_modes().items():
+            configure(lean, renderer)
+            for name, url in cases:
+                result = run_case(client, url, options)
+                results['cases'][f'{name} [{mode}]'] = result
+                print(
+                    f'{name + " [" + mode + "]":40} '
+                    f'{result["cpu_p50_ms"]:8.2f} '
+                    f'{result["cpu_mean_ms"]:9.2f} {result["bytes"]:7}'
+                )
+        print()
+        for name, _ in cases:
+            base = results['cases'][f'{name} [drf]']['cpu_mean_ms']
+            for mode in build_modes():
+                current = results['cases'][f'{name} [{mode}]']['cpu_mean_ms']
+                print(f'{name:25} {mode:12} x{base / current:.2f}')
+        path = common.write_results('render', results, options.output)
+        print(f'Результаты: {path}')
+        if options.compare:
+            common.compare(
+                results, options.compare,
+                metrics=('cpu_p50_ms', 'cpu_mean_ms'),
+            )
+    finally:
+        common.destroy_database(old_name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""Параллельные чтение и запись в файловую SQLite с PRAGMA и без них.
+
+Для каждого режима создаётся свежий файл базы, затем потоки-читатели
+запрашивают список произведений, а потоки-писатели добавляют комментарии.
+
+Пример:
+    python benchmarks/sqlite_bench.py --readers 8 --writers 2 --duration 5
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common  # noqa: E402
+
+# режим SQLite по умолчанию: журнал отката и полная синхронизация
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+    'busy_timeout': 5000,
+}
+
+
+def reader(stop, stats):
+    from django.db import connection
+
+    from titcatgen.models import Title
+
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            list(Title.objects.for_api()[:10])
+        except Exception:
+            stats['read_errors'] += 1
+        else:
+            stats['reads'] += 1
+            stats['read_latency'].append(time.perf_counter() - started)
+    connection.close()
+
+
+def writer(stop, stats, review_id, author_id):
+    from django.db import connection
+
+    from reviews.models import Comment
+
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            Comment.objects.create(
+                review_id=review_id, author_id=author_id, text='Бенчмарк'
+            )
+        except Exception:
+            stats['write_errors'] += 1
+        else:
+            stats['writes'] += 1
+            stats['write_latency'].append(time.perf_counter() - started)
+    connection.close()
+
+
+def run_mode(name, pragmas, options):
+    from django.conf import settings
+    from django.db import connection
+
+    from reviews.models import Review
+
+    settings.SQLITE_PRAGMAS = pragmas
+    directory = tempfile.mkdtemp()
+    old_name = common.create_database(os.path.join(directory, 'bench.sqlite3'))
+    try:
+        common.seed(options)
+        review = Review.objects.first()
+        connection.close()
+        stats = {
+            'reads': 0, 'writes': 0, 'read_errors': 0, 'write_errors': 0,
+            'read_latency': [], 'write_latency': [],
+        }
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=reader, args=(stop, stats))
+            for _ in range(options.readers)
+        ] + [
+            threading.Thread(
+                target=writer,
+                args=(stop, stats, review.pk, review.author_id),
+            )
+            for _ in range(options.writers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(options.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        common.destroy_database(old_name)
+        shutil.rmtree(directory, ignore_errors=True)
+    result = {
+        'pragmas': pragmas,
+        'reads_per_s': stats['reads'] / options.duration,
+        'writes_per_s': stats['writes'] / options.duration,
+        'read_errors': stats['read_errors'],
+        'write_errors': stats['write_errors'],
+    }
+    for kind in ('read', 'write'):
+        for label, value in common.percentiles(
+            stats[f'{kind}_latency']
+        ).items():
+            result[f'{kind}_{label}_ms'] = value * 1000
+    print(
+        f'{name:8} чтений/с {result["reads_per_s"]:9.1f}  '
+        f'записей/с {result["writes_per_s"]:8.1f}  '
+        f'p95 чтения {result["read_p95_ms"]:7.2f} мс  '
+        f'p95 записи {result["write_p95_ms"]:7.2f} мс  '
+        f'ошибок {result["read_errors"] + result["write_errors"]}'
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    common.add_size_arguments(parser)
+    parser.set_defaults(titles=200, reviews_per_title=5)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--output', help='Файл для результатов JSON.')
+    parser.add_argument('--compare', help='Результаты прошлого прогона.')
+    options = parser.parse_args()
+
+    common.setup_django()
+    from django.conf import settings
+    tuned = dict(settings.SQLITE_PRAGMAS)
+    results = {
+        'meta': common.metadata('sqlite', options),
+        'cases': {
+            'default': run_mode('default', DEFAULT_PRAGMAS, options),
+            'tuned': run_mode('tuned', tuned, options),
+        },
+    }
+    default, tuned = results['cases']['default'], results['cases']['tuned']
+    for metric in ('reads_per_s', 'writes_per_s'):
+        if default[metric]:
+            print(f'{metric}: x{tuned[metric] / default[metric]:.2f}')
+    path = common.write_results('sqlite', results, options.output)
+    print(f'Результаты: {path}')
+    if options.compare:
+        common.compare(
+            results, options.compare, metrics=('read_p95_ms', 'write_p95_ms')
+        )
+
+
+if __name__ == '__main__':
+    main()
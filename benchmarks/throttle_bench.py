@@ -0,0 +1,111 @@
+"""Накладные расходы ограничения частоты на один запрос: корзина токенов
+api.throttling против ScopedRateThrottle из DRF (история запросов в кеше).
+
+Пример:
+    python benchmarks/throttle_bench.py --iterations 100000 --clients 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import common  # noqa: E402
+
+SCOPE = 'bench'
+
+
+class View:
+    throttle_scope = SCOPE
+
+
+def build_requests(clients):
+    from django.contrib.auth.models import AnonymousUser
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    factory = APIRequestFactory()
+    requests = []
+    for number in range(clients):
+        request = Request(factory.get(
+            '/', REMOTE_ADDR=f'10.{number // 65536}.{number // 256 % 256}.'
+                             f'{number % 256}'
+        ))
+        request.user = AnonymousUser()
+        requests.append(request)
+    return requests
+
+
+def run_case(throttle_class, requests, options):
+    from django.core.cache import cache
+
+    cache.clear()
+    view = View()
+    samples = []
+    allowed = 0
+    for number in range(options.iterations):
+        request = requests[number % len(requests)]
+        started = time.perf_counter_ns()
+        allowed += throttle_class().allow_request(request, view)
+        samples.append((time.perf_counter_ns() - started) / 1000)
+    result = {
+        'mean_us': sum(samples) / len(samples),
+        'allowed': allowed,
+    }
+    result.update({
+        f'{name}_us': value
+        for name, value in common.percentiles(samples).items()
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=50000)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 1000])
+    parser.add_argument(
+        '--rate', default='100000/min',
+        help='Ставка области; по умолчанию запросы не отклоняются.',
+    )
+    parser.add_argument('--output', help='Файл для результатов JSON.')
+    parser.add_argument('--compare', help='Результаты прошлого прогона.')
+    options = parser.parse_args()
+
+    common.setup_django()
+    from rest_framework.throttling import ScopedRateThrottle
+
+    from api.throttling import TokenBucketThrottle
+
+    # у обоих классов общий словарь ставок из настроек DRF
+    TokenBucketThrottle.THROTTLE_RATES[SCOPE] = options.rate
+    throttles = {
+        'token-bucket': TokenBucketThrottle,
+        'drf-scoped': ScopedRateThrottle,
+    }
+    results = {
+        'meta': common.metadata('throttle', options),
+        'cases': {},
+    }
+    print(f'{"case":30} {"mean":>8} {"p50":>8} {"p99":>8} {"allowed":>8}')
+    for clients in options.clients:
+        requests = build_requests(clients)
+        for name, throttle_class in throttles.items():
+            result = run_case(throttle_class, requests, options)
+            case = f'{name} clients={clients}'
+            results['cases'][case] = result
+            print(
+                f'{case:30} {result["mean_us"]:8.2f} {result["p50_us"]:8.2f} '
+                f'{result["p99_us"]:8.2f} {result["allowed"]:8}'
+            )
+    print('Время в микросекундах на запрос.')
+    path = common.write_results('throttle', results, options.output)
+    print(f'Результаты: {path}')
+    if options.compare:
+        common.compare(
+            results, options.compare, metrics=('p50_us', 'mean_us')
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -34,3 +35,18 @@ assert get_version() < '3.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    from api.throttling import local_buckets
+    cache.clear()
+    local_buckets.clear()
+
+
+@pytest.fixture(autouse=True)
+def query_budget(settings):
+    # превышение бюджета SQL-запросов в тестах — ошибка
+    settings.QUERY_BUDGET_RAISE = True
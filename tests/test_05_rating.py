@@ -0,0 +1,131 @@
+import pytest
+from django.core.management import call_command
+
+from api.serializers import TitleCreateSerializer
+from reviews.models import Review, TitleRatingStats
+from titcatgen.models import Title
+
+from .common import create_reviews
+
+
+def counters(title_id):
+    return Title.objects.values(
+        'rating_sum', 'rating_count', 'rating', 'weighted_rating'
+    ).get(pk=title_id)
+
+
+def expected(scores):
+    if not scores:
+        return {
+            'rating_sum': 0, 'rating_count': 0,
+            'rating': None, 'weighted_rating': None,
+        }
+    # TITLE_RATING_PRIOR_COUNT = 5, TITLE_RATING_PRIOR_MEAN = 6
+    return {
+        'rating_sum': sum(scores),
+        'rating_count': len(scores),
+        'rating': pytest.approx(sum(scores) / len(scores)),
+        'weighted_rating': pytest.approx(
+            (sum(scores) + 30) / (len(scores) + 5)
+        ),
+    }
+
+
+def assert_counters(title_id, scores, action):
+    assert counters(title_id) == expected(scores), (
+        f'Проверьте, что после {action} счётчики рейтинга произведения '
+        'совпадают с его отзывами'
+    )
+    histogram = TitleRatingStats.for_title(
+        Title.objects.get(pk=title_id)
+    ).histogram
+    assert {score: count for score, count in histogram.items() if count} == {
+        score: scores.count(score) for score in set(scores)
+    }
+
+
+class Test05Rating:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_create_update_delete(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        assert_counters(title_id, [5, 3, 4], 'создания отзывов')
+
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'score': 10})
+        assert_counters(title_id, [10, 3, 4], 'изменения оценки')
+
+        admin_client.patch(f'{url}{reviews[1]["id"]}/', data={'text': 'Ок'})
+        assert_counters(title_id, [10, 3, 4], 'изменения текста')
+
+        admin_client.delete(f'{url}{reviews[2]["id"]}/')
+        assert_counters(title_id, [10, 3], 'удаления отзыва')
+
+        for review in reviews[:2]:
+            admin_client.delete(f'{url}{review["id"]}/')
+        assert_counters(title_id, [], 'удаления всех отзывов')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_cascade_delete(self, admin_client, admin):
+        _, titles, user, moderator = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        user.delete()
+        assert_counters(title_id, [5, 4], 'удаления автора отзыва')
+        admin_client.delete(f'/api/v1/users/{moderator.username}/')
+        assert_counters(title_id, [5], 'удаления автора через API')
+
+        Review.objects.create(
+            title_id=titles[1]['id'], author=admin, text='Тоже', score=8
+        )
+        admin_client.delete(f'/api/v1/titles/{title_id}/')
+        assert not Review.objects.filter(title_id=title_id).exists()
+        assert_counters(titles[1]['id'], [8], 'удаления другого произведения')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_save_keeps_counters(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        title_id = titles[1]['id']
+        # экземпляр загружен до отзыва, как в PATCH параллельно с отзывом
+        stale = Title.objects.for_api().get(pk=title_id)
+        Review.objects.create(
+            title=stale, author=admin, text='Параллельно', score=7
+        )
+        serializer = TitleCreateSerializer(
+            stale, data={'name': 'Новое имя'}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        assert_counters(title_id, [7], 'сохранения устаревшего экземпляра')
+
+        response = admin_client.patch(
+            f'/api/v1/titles/{title_id}/', data={'year': 2001}
+        )
+        assert response.status_code == 200
+        assert_counters(title_id, [7], 'PATCH произведения')
+        assert Title.objects.get(pk=title_id).name == 'Новое имя'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_recalculate_ratings(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        Title.objects.update(
+            rating_sum=100, rating_count=1, rating=1, weighted_rating=1
+        )
+        TitleRatingStats.objects.all().delete()
+        call_command('recalculate_ratings', stdout=open('/dev/null', 'w'))
+        assert_counters(titles[0]['id'], [5, 3, 4], 'recalculate_ratings')
+        assert_counters(titles[1]['id'], [], 'recalculate_ratings')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_concurrent_rescore(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        # два запроса загрузили отзыв с оценкой 5 до изменений друг друга
+        first = Review.objects.get(pk=reviews[0]['id'])
+        second = Review.objects.get(pk=reviews[0]['id'])
+        first.score = 9
+        first.save()
+        second.score = 7
+        second.save()
+        assert_counters(
+            titles[0]['id'], [7, 3, 4], 'параллельных изменений оценки'
+        )
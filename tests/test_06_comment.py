@@ -153,6 +153,10 @@ class Test06CommentAPI:
             'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/` '
             'возвращаете данные объекта. Значение `author` неправильное.'
         )
+        assert set(data) == {'id', 'review', 'text', 'author', 'pub_date'}, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/` '
+            'возвращаются только поля `id`, `review`, `text`, `author`, `pub_date`.'
+        )
 
         data = {'text': 'rewq'}
         response = admin_client.patch(f'{pre_url}{comments[0]["id"]}/', data=data)
@@ -246,3 +250,18 @@ class Test06CommentAPI:
             'без токена авторизации возвращается статус 401'
         )
         self.check_permissions(user, 'обычного пользователя', f'{pre_url}{comments[2]["id"]}/')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_comment_wrong_title(self, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        pre_url = f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        response = admin_client.get(pre_url)
+        assert response.status_code == 404, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/reviews/{review_id}/comments/` '
+            'для отзыва другого произведения возвращается статус 404'
+        )
+        response = admin_client.get(f'{pre_url}{comments[0]["id"]}/')
+        assert response.status_code == 404, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/` '
+            'для отзыва другого произведения возвращается статус 404'
+        )
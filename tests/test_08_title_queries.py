@@ -0,0 +1,38 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_categories, create_genre
+
+
+class Test08TitleQueries:
+
+    def create_titles(self, admin_client, count, genres, categories):
+        for i in range(count):
+            data = {
+                'name': f'Произведение {i}', 'year': 2000,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[i % len(categories)]['slug'],
+            }
+            response = admin_client.post('/api/v1/titles/', data=data)
+            assert response.status_code == 201
+
+    def count_list_queries(self, client):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        return len(response.json()['results']), len(context)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_list_queries(self, client, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        self.create_titles(admin_client, 2, genres, categories)
+        small_page, small_queries = self.count_list_queries(client)
+        self.create_titles(admin_client, 8, genres, categories)
+        large_page, large_queries = self.count_list_queries(client)
+        assert large_page > small_page
+        assert large_queries == small_queries, (
+            'Проверьте, что количество запросов к БД при GET запросе '
+            '`/api/v1/titles/` не зависит от размера страницы'
+        )
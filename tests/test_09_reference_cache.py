@@ -0,0 +1,41 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_categories, create_genre
+
+
+class Test09ReferenceCache:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('url, create', (
+        ('/api/v1/categories/', create_categories),
+        ('/api/v1/genres/', create_genre),
+    ))
+    def test_01_etag(self, client, admin_client, url, create):
+        create(admin_client)
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag, (
+            f'Проверьте, что при GET запросе `{url}` возвращается заголовок `ETag`'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Проверьте, что при GET запросе `{url}` с актуальным `If-None-Match` '
+            'возвращается статус 304'
+        )
+        assert len(context) == 0, (
+            f'Проверьте, что ответ 304 на `{url}` не обращается к БД'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalidation(self, client, admin_client):
+        categories = create_categories(admin_client)
+        etag = client.get('/api/v1/categories/')['ETag']
+        admin_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        response = client.get('/api/v1/categories/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после изменения категорий кеш списка сбрасывается'
+        )
+        assert response.json()['count'] == len(categories) - 1
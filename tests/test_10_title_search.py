@@ -0,0 +1,32 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test10TitleSearch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?q=поворот')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/?q=` возвращается статус 200'
+        )
+        data = response.json()
+        assert data['count'] == 1 and data['results'][0]['id'] == titles[0]['id'], (
+            'Проверьте, что поиск `?q=` не зависит от регистра и ищет по названию'
+        )
+        response = client.get('/api/v1/titles/?q=драма')
+        data = response.json()
+        assert data['count'] == 1 and data['results'][0]['id'] == titles[1]['id'], (
+            'Проверьте, что поиск `?q=` ищет по описанию произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_search_index_sync(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Переименовано'})
+        assert client.get('/api/v1/titles/?q=поворот').json()['count'] == 0
+        assert client.get('/api/v1/titles/?q=переименовано').json()['count'] == 1
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert client.get('/api/v1/titles/?q=переименовано').json()['count'] == 0
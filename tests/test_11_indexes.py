@@ -0,0 +1,66 @@
+import re
+
+import pytest
+from django.db import connection
+
+from reviews.models import Comment, Review
+from titcatgen.models import Title
+
+# полный проход по таблице без индекса: "SCAN titcatgen_title"
+FULL_SCAN = re.compile(r'\bSCAN (TABLE )?\w+$')
+
+
+def explain(queryset):
+    return [line.strip() for line in queryset.explain().splitlines()]
+
+
+def full_scans(plan):
+    return [line for line in plan if FULL_SCAN.search(line)]
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='План запроса проверяется только для SQLite',
+)
+class Test11Indexes:
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('filters', [
+        {},
+        {'category__slug': 'films'},
+        {'year': 2000},
+        {'category__slug': 'films', 'year': 2000},
+    ])
+    def test_01_title_list_plan(self, filters):
+        plan = explain(Title.objects.for_api().filter(**filters)[:10])
+        assert not full_scans(plan), (
+            f'Список произведений с фильтром {filters} должен использовать '
+            f'индекс, а не полный проход по таблице: {plan}'
+        )
+        assert not any('TEMP B-TREE' in line for line in plan), (
+            f'Сортировка списка произведений с фильтром {filters} должна '
+            f'идти по индексу: {plan}'
+        )
+
+    @pytest.mark.django_db
+    def test_02_title_genre_plan(self):
+        queryset = Title.objects.for_api().filter(genre__slug='drama')[:10]
+        plan = explain(queryset)
+        assert not full_scans(plan), (
+            'Фильтр произведений по жанру должен использовать индексы: '
+            f'{plan}'
+        )
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('queryset', [
+        Review.objects.filter(title_id=1),
+        Comment.objects.filter(review_id=1),
+    ], ids=['reviews', 'comments'])
+    def test_03_nested_list_plan(self, queryset):
+        plan = explain(queryset[:10])
+        assert not full_scans(plan), (
+            f'Вложенный список должен выбираться по индексу: {plan}'
+        )
+        assert not any('TEMP B-TREE' in line for line in plan), (
+            f'Сортировка вложенного списка должна идти по индексу: {plan}'
+        )
@@ -0,0 +1,119 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_categories, create_genre
+
+URL = '/api/v1/titles/bulk/'
+
+
+def post_bulk(client, items):
+    return client.post(
+        URL, data=json.dumps(items), content_type='application/json'
+    )
+
+
+class Test12TitleBulk:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_bulk_create(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        items = [
+            {
+                'name': f'Произведение {i}', 'year': 2000,
+                'description': 'Описание',
+                'genre': [genres[0]['slug'], genres[i % 3]['slug']],
+                'category': categories[i % 2]['slug'],
+            }
+            for i in range(5)
+        ]
+        response = post_bulk(admin_client, items)
+        assert response.status_code == 201, (
+            f'Проверьте, что POST запрос `{URL}` со списком произведений '
+            'возвращает статус 201'
+        )
+        data = response.json()
+        assert data['errors'] == []
+        assert [item['index'] for item in data['created']] == list(range(5))
+        for item, created in zip(items, data['created']):
+            response = admin_client.get(f'/api/v1/titles/{created["id"]}/')
+            title = response.json()
+            assert title['name'] == item['name'], (
+                f'Проверьте, что `{URL}` возвращает id созданных произведений'
+            )
+            assert title['category']['slug'] == item['category']
+            assert (
+                {genre['slug'] for genre in title['genre']}
+                == set(item['genre'])
+            ), f'Проверьте, что `{URL}` сохраняет жанры произведений'
+        response = admin_client.get('/api/v1/titles/?q=Произведение')
+        assert response.json()['count'] == 5, (
+            f'Проверьте, что произведения из `{URL}` попадают в поиск'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bulk_errors(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        items = [
+            {'name': 'Верное', 'year': 2000,
+             'genre': [genres[0]['slug']], 'category': categories[0]['slug']},
+            {'name': 'Без категории', 'year': 2000,
+             'genre': [genres[0]['slug']], 'category': 'unknown'},
+            {'name': 'Без года', 'genre': [], 'category': 'films'},
+            {'name': 'Неизвестный жанр', 'year': 2000,
+             'genre': ['unknown'], 'category': categories[1]['slug']},
+        ]
+        response = post_bulk(admin_client, items)
+        assert response.status_code == 201
+        data = response.json()
+        assert [item['index'] for item in data['created']] == [0], (
+            f'Проверьте, что `{URL}` создаёт только корректные произведения'
+        )
+        errors = {item['index']: item['errors'] for item in data['errors']}
+        assert set(errors) == {1, 2, 3}, (
+            f'Проверьте, что `{URL}` возвращает ошибки по каждому элементу'
+        )
+        assert 'category' in errors[1]
+        assert 'year' in errors[2]
+        assert 'genre' in errors[3]
+        response = post_bulk(admin_client, items[1:])
+        assert response.status_code == 400, (
+            f'Проверьте, что `{URL}` возвращает 400, если ничего не создано'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_bulk_queries(self, admin_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+
+        def count_queries(count):
+            items = [
+                {'name': f'Произведение {i}', 'year': 2000,
+                 'genre': [genre['slug'] for genre in genres],
+                 'category': categories[i % 2]['slug']}
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as context:
+                response = post_bulk(admin_client, items)
+            assert response.status_code == 201
+            return len(context)
+
+        assert count_queries(2) == count_queries(20), (
+            f'Проверьте, что количество запросов `{URL}` не зависит от '
+            'размера списка'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_bulk_not_admin(self, client, admin_client):
+        response = post_bulk(client, [{'name': 'Произведение'}])
+        assert response.status_code == 401, (
+            f'Проверьте, что `{URL}` недоступен без токена'
+        )
+        response = post_bulk(admin_client, {'name': 'Произведение'})
+        assert response.status_code == 400, (
+            f'Проверьте, что `{URL}` принимает только список'
+        )
@@ -0,0 +1,100 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import TitleRatingStats
+
+from .common import auth_client, create_reviews, create_titles
+
+EMPTY_HISTOGRAM = {str(score): 0 for score in range(1, 11)}
+
+
+class Test13RatingStats:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_stats_without_reviews(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET запрос `{url}` возвращает статус 200'
+        )
+        assert response.json() == {
+            'count': 0, 'mean': None, 'median': None, 'stddev': None,
+            'histogram': EMPTY_HISTOGRAM,
+        }, (
+            f'Проверьте, что `{url}` для произведения без отзывов '
+            'возвращает пустое распределение'
+        )
+        response = client.get('/api/v1/titles/0/stats/')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_stats_follow_reviews(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/stats/'
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(url).json()
+        assert len(context) == 1, (
+            f'Проверьте, что `{url}` читает одну строку одним запросом'
+        )
+        histogram = dict(EMPTY_HISTOGRAM, **{'3': 1, '4': 1, '5': 1})
+        assert data == {
+            'count': 3, 'mean': 4.0, 'median': 4.0,
+            'stddev': pytest.approx((2 / 3) ** 0.5),
+            'histogram': histogram,
+        }, f'Проверьте, что `{url}` возвращает распределение оценок'
+
+        response = auth_client(user).patch(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/',
+            data={'score': 10},
+        )
+        assert response.status_code == 200
+        data = client.get(url).json()
+        assert data['histogram'] == dict(
+            EMPTY_HISTOGRAM, **{'4': 1, '5': 1, '10': 1}
+        ), 'Проверьте, что распределение обновляется при изменении оценки'
+        assert data['median'] == 5.0
+
+        response = admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/'
+        )
+        assert response.status_code == 204
+        data = client.get(url).json()
+        assert data['histogram'] == dict(
+            EMPTY_HISTOGRAM, **{'4': 1, '10': 1}
+        ), 'Проверьте, что распределение обновляется при удалении отзыва'
+        assert data['count'] == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_expand_stats(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        response = client.get('/api/v1/titles/')
+        assert 'stats' not in response.json()['results'][0], (
+            'Проверьте, что `stats` отдаётся только по `?expand=stats`'
+        )
+        response = client.get('/api/v1/titles/?expand=stats')
+        results = {
+            title['id']: title for title in response.json()['results']
+        }
+        assert results[titles[0]['id']]['stats']['count'] == 3, (
+            'Проверьте, что `?expand=stats` добавляет распределение оценок'
+        )
+        assert results[titles[1]['id']]['stats']['count'] == 0
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/?expand=stats'
+        )
+        assert response.json()['stats']['histogram']['4'] == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_recalculate_stats(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        expected = client.get(url).json()
+        TitleRatingStats.objects.all().delete()
+        call_command('recalculate_ratings')
+        assert client.get(url).json() == expected, (
+            'Проверьте, что `recalculate_ratings` пересчитывает распределение'
+        )
@@ -0,0 +1,100 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_comments, create_reviews
+
+
+def get_with_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response.json(), [query['sql'] for query in context]
+
+
+class Test14SparseFields:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_fields(self, client, admin_client, admin):
+        create_reviews(admin_client, admin)
+        full, full_queries = get_with_queries(client, '/api/v1/titles/')
+        data, queries = get_with_queries(
+            client, '/api/v1/titles/?fields=id,name,rating'
+        )
+        for title in data['results']:
+            assert set(title) == {'id', 'name', 'rating'}, (
+                'Проверьте, что `?fields=` оставляет в ответе '
+                '`/api/v1/titles/` только запрошенные поля'
+            )
+        assert data['count'] == full['count']
+        assert len(queries) < len(full_queries), (
+            'Проверьте, что для полей, которых нет в `?fields=`, '
+            'не выполняются запросы предзагрузки'
+        )
+        assert not any('"description"' in sql for sql in queries), (
+            'Проверьте, что поля, которых нет в `?fields=`, '
+            'не загружаются из БД'
+        )
+        assert not any('titcatgen_category' in sql for sql in queries)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_expand(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        data, _ = get_with_queries(
+            client, '/api/v1/titles/?fields=id,name&expand=stats'
+        )
+        for title in data['results']:
+            assert set(title) == {'id', 'name', 'stats'}, (
+                'Проверьте, что `?expand=` добавляет поле к `?fields=`'
+            )
+        data, _ = get_with_queries(
+            client, f'/api/v1/titles/{titles[0]["id"]}/?fields=name,genre'
+        )
+        assert set(data) == {'name', 'genre'}
+        assert {genre['slug'] for genre in data['genre']} == {
+            'horror', 'comedy'
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_review_fields(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data, queries = get_with_queries(client, url + '?fields=id,score')
+        for review in data['results']:
+            assert set(review) == {'id', 'score'}, (
+                f'Проверьте, что `?fields=` поддерживается в `{url}`'
+            )
+        assert not any('users_user' in sql for sql in queries), (
+            'Проверьте, что автор не загружается, если его нет в `?fields=`'
+        )
+        assert not any('"text"' in sql for sql in queries)
+        data, _ = get_with_queries(client, url + '?fields=author,title')
+        assert data['results'][0] == {
+            'author': admin.username, 'title': titles[0]['name']
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_comment_fields(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        data, _ = get_with_queries(client, url + '?fields=id,text')
+        assert data['results'] == [
+            {'id': comment['id'], 'text': comment['text']}
+            for comment in comments
+        ], f'Проверьте, что `?fields=` поддерживается в `{url}`'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_fields_ignored_on_write(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        response = admin_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/?fields=id',
+            data={'text': 'Текст', 'score': 7},
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что `?fields=` не влияет на проверку данных при '
+            'создании объекта'
+        )
+        assert response.json()['score'] == 7
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.serializers import LeanListSerializer
+
+from .common import create_reviews
+
+DATA = {
+    'results': [
+        {'id': 1, 'name': 'Проект\u2028', 'rating': 4.25, 'genre': []},
+        {'id': 2, 'name': 'Поворот', 'rating': None, 'stats': {1: 0}},
+    ],
+}
+
+
+def get_json(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.json()
+
+
+class Test15LeanLists:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('query', [
+        '', '?fields=id,name,rating', '?genre=horror', '?q=Проект',
+        '?fields=genre,category&page=1',
+    ])
+    def test_01_title_list_matches_serializer(
+            self, client, admin_client, admin, monkeypatch, query):
+        create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{query}'
+        lean = get_json(client, url)
+        monkeypatch.setattr(LeanListSerializer, 'supports', lambda self: False)
+        cache.clear()
+        assert lean == get_json(client, url), (
+            f'Проверьте, что быстрый путь `{url}` отдаёт те же данные, '
+            'что и сериализатор'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('query', [
+        '', '?cursor=', '?fields=author,title', '?limit=2&offset=1',
+    ])
+    def test_02_review_list_matches_serializer(
+            self, client, admin_client, admin, monkeypatch, query):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{query}'
+        lean = get_json(client, url)
+        monkeypatch.setattr(LeanListSerializer, 'supports', lambda self: False)
+        cache.clear()
+        assert lean == get_json(client, url), (
+            f'Проверьте, что быстрый путь `{url}` отдаёт те же данные, '
+            'что и сериализатор'
+        )
+
+    def test_03_fast_renderer(self, monkeypatch):
+        expected = JSONRenderer().render(DATA)
+        assert json.loads(renderers.FastJSONRenderer().render(DATA)) == (
+            json.loads(expected)
+        )
+        assert b'\\u2028' in renderers.FastJSONRenderer().render(DATA), (
+            'Проверьте, что FastJSONRenderer экранирует U+2028'
+        )
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert renderers.FastJSONRenderer().render(DATA) == expected, (
+            'Проверьте, что без orjson используется стандартный рендерер'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_fast_parser(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/categories/', data='{"name": "Фильм", "slug": ',
+            content_type='application/json',
+        )
+        assert response.status_code == 400
+        assert 'JSON parse error' in response.json()['detail']
+        response = admin_client.post(
+            '/api/v1/categories/',
+            data=json.dumps({'name': 'Фильм', 'slug': 'films'}),
+            content_type='application/json',
+        )
+        assert response.status_code == 201
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import time
+
+import pytest
+from django.db.backends.signals import connection_created
+
+from .common import create_reviews
+
+
+async def asgi_get(application, path):
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'',
+        'headers': [(b'host', b'testserver')],
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    body = b''.join(message.get('body', b'') for message in messages[1:])
+    return messages[0]['status'], body
+
+
+def run_concurrently(application, paths):
+    async def main():
+        return await asyncio.gather(*(
+            asgi_get(application, path) for path in paths
+        ))
+    return asyncio.run(main())
+
+
+class Test16ASGI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_asgi_read(self, client, admin_client, admin):
+        from api_yamdb.asgi import ReadPoolASGIHandler
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        application = ReadPoolASGIHandler()
+        paths = [
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            '/api/v1/categories/',
+        ]
+        responses = run_concurrently(application, paths)
+        application.read_executor.shutdown()
+        for path, (status, body) in zip(paths, responses):
+            assert status == 200, (
+                f'Проверьте, что GET `{path}` под ASGI возвращает 200'
+            )
+            assert json.loads(body) == client.get(path).json(), (
+                f'Проверьте, что GET `{path}` под ASGI и WSGI совпадают'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_asgi_reads_run_in_parallel(self, admin_client, admin):
+        from api_yamdb.asgi import ReadPoolASGIHandler
+
+        create_reviews(admin_client, admin)
+        latency = 0.05
+
+        def slow_execute(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+
+        def add_latency(sender, connection, **kwargs):
+            # в начало списка: execute_wrapper() профилировщика снимает
+            # последний элемент
+            connection.execute_wrappers.insert(0, slow_execute)
+
+        application = ReadPoolASGIHandler()
+        connection_created.connect(add_latency)
+        try:
+            paths = ['/api/v1/titles/'] * 6
+            started = time.perf_counter()
+            results = run_concurrently(application, paths)
+            elapsed = time.perf_counter() - started
+        finally:
+            connection_created.disconnect(add_latency)
+            application.read_executor.shutdown()
+        assert all(status == 200 for status, _ in results)
+        # каждый запрос делает не меньше двух запросов к БД
+        sequential = len(paths) * 2 * latency
+        assert elapsed < sequential * 0.75, (
+            'Проверьте, что чтения под ASGI выполняются параллельно, '
+            'а не в одном общем потоке'
+        )
@@ -0,0 +1,114 @@
+import time
+
+import pytest
+
+from api import throttling
+from api.checks import check_shared_cache
+from api.throttling import TokenBucketThrottle
+
+from .common import auth_client, create_titles
+
+
+class Test17Throttling:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_throttled(self, client, monkeypatch):
+        monkeypatch.setitem(TokenBucketThrottle.THROTTLE_RATES, 'signup', '2/min')
+        for number in range(2):
+            response = client.post(self.url_signup, data={
+                'username': f'user{number}', 'email': f'user{number}@yamdb.fake'
+            })
+            assert response.status_code == 200
+        response = client.post(self.url_signup, data={
+            'username': 'user3', 'email': 'user3@yamdb.fake'
+        })
+        assert response.status_code == 429, (
+            f'Проверьте, что `{self.url_signup}` ограничивает частоту запросов'
+        )
+        assert int(response['Retry-After']) in (30, 31), (
+            'Проверьте, что ответ 429 содержит заголовок Retry-After'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_read_per_user_and_ip(
+            self, client, admin_client, user, monkeypatch):
+        create_titles(admin_client)
+        monkeypatch.setitem(TokenBucketThrottle.THROTTLE_RATES, 'read', '2/min')
+        url = '/api/v1/titles/'
+        assert [client.get(url).status_code for _ in range(3)] == [
+            200, 200, 429
+        ], f'Проверьте, что анонимные GET `{url}` ограничиваются по IP'
+        assert auth_client(user).get(url).status_code == 200, (
+            'Проверьте, что авторизованные пользователи считаются отдельно'
+        )
+        assert client.get('/api/v1/categories/').status_code == 200, (
+            'Проверьте, что ограничение действует только в своей области'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_processes_share_counter(self, client, monkeypatch):
+        monkeypatch.setitem(TokenBucketThrottle.THROTTLE_RATES, 'token', '4/min')
+        processes = [{}, {}]
+        statuses = []
+        for number in range(10):
+            # у каждого процесса свои корзины, общий только кеш
+            monkeypatch.setattr(
+                throttling, 'local_buckets', processes[number % 2]
+            )
+            response = client.post('/api/v1/auth/token/', data={
+                'username': 'nobody', 'confirmation_code': 'x'
+            })
+            statuses.append(response.status_code)
+        # расхождение не больше одной пачки синхронизации
+        assert 5 <= statuses.count(429) <= 6, (
+            'Проверьте, что процессы делят одну корзину через общий кеш'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_active_bucket_not_evicted(self, client, monkeypatch):
+        monkeypatch.setitem(
+            TokenBucketThrottle.THROTTLE_RATES, 'token', '10/min'
+        )
+        now = [time.monotonic()]
+        monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+        allowed = 0
+        # 5 запросов в секунду на протяжении двух минут
+        for _ in range(605):
+            now[0] += 0.2
+            response = client.post('/api/v1/auth/token/', data={
+                'username': 'nobody', 'confirmation_code': 'x'
+            })
+            allowed += response.status_code != 429
+        # 10 токенов корзины и 10 в минуту за 121 секунду
+        assert allowed <= 31, (
+            'Проверьте, что активная корзина не сбрасывается по истечении '
+            f'срока хранения: пропущено {allowed} запросов'
+        )
+        assert allowed >= 29
+        now[0] += 61
+        statuses = [
+            client.post('/api/v1/auth/token/', data={
+                'username': 'nobody', 'confirmation_code': 'x'
+            }).status_code
+            for _ in range(11)
+        ]
+        assert statuses.count(429) == 1, (
+            'Проверьте, что после простоя корзина снова полна'
+        )
+
+    def test_05_local_cache_warning(self, settings):
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        assert [error.id for error in check_shared_cache(None)] == [
+            'api.W001'
+        ], (
+            'Проверьте, что при кеше своём у каждого процесса выводится '
+            'предупреждение: ограничение частоты действует на процесс'
+        )
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION': '127.0.0.1:11211',
+        }}
+        assert check_shared_cache(None) == []
@@ -0,0 +1,98 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_reviews, create_titles
+
+
+def assert_not_modified(client, url, response):
+    with CaptureQueriesContext(connection) as context:
+        repeated = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert repeated.status_code == 304, (
+        f'Проверьте, что GET `{url}` с актуальным `If-None-Match` '
+        'возвращает 304'
+    )
+    assert len(context) == 0, (
+        f'Проверьте, что ответ 304 на `{url}` не обращается к БД'
+    )
+
+
+class Test18TitleCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_headers(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        for url in (
+            '/api/v1/titles/?year=2000',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+        ):
+            response = client.get(url)
+            assert response.status_code == 200
+            for header in ('ETag', 'Last-Modified'):
+                assert response.has_header(header), (
+                    f'Проверьте, что GET `{url}` возвращает `{header}`'
+                )
+            assert response['Cache-Control'].startswith('public'), (
+                f'Проверьте, что GET `{url}` разрешает кеширование прокси'
+            )
+            assert_not_modified(client, url, response)
+            response = client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+            )
+            assert response.status_code == 304
+        response = admin_client.get('/api/v1/titles/')
+        assert 'public' not in response.get('Cache-Control', ''), (
+            'Проверьте, что ответы авторизованным пользователям '
+            'не кешируются как общие'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_normalized_query(self, client, admin_client):
+        create_titles(admin_client)
+        etag = client.get('/api/v1/titles/?year=2000&page=1')['ETag']
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/titles/?page=1&year=2000')
+        assert response['ETag'] == etag
+        assert len(context) == 0, (
+            'Проверьте, что порядок параметров запроса не влияет на ключ кеша'
+        )
+        response = client.get('/api/v1/titles/?year=2020')
+        assert response['ETag'] != etag
+        assert response.json()['results'][0]['name'] == 'Проект'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_invalidation(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        list_url = '/api/v1/titles/'
+        detail_url = f'/api/v1/titles/{titles[1]["id"]}/'
+        other_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        responses = {url: client.get(url) for url in (
+            list_url, detail_url, other_url
+        )}
+        admin_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'Ещё отзыв', 'score': 10},
+        )
+        response = client.get(
+            detail_url, HTTP_IF_NONE_MATCH=responses[detail_url]['ETag']
+        )
+        assert response.status_code == 200
+        assert response.json()['rating'] == 10, (
+            'Проверьте, что новый отзыв сбрасывает кеш страницы произведения'
+        )
+        assert client.get(list_url).json() != responses[list_url].json(), (
+            'Проверьте, что новый отзыв сбрасывает кеш списка произведений'
+        )
+        assert_not_modified(client, other_url, responses[other_url])
+
+        admin_client.patch(other_url, data={'genre': ['horror']})
+        response = client.get(other_url)
+        assert [genre['slug'] for genre in response.json()['genre']] == [
+            'horror'
+        ], 'Проверьте, что смена жанров сбрасывает кеш произведения'
+
+        admin_client.delete('/api/v1/genres/horror/')
+        response = client.get(other_url)
+        assert 'horror' not in [
+            genre['slug'] for genre in response.json()['genre']
+        ], 'Проверьте, что удаление жанра сбрасывает кеш произведений'
@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_comments, create_reviews
+
+
+def detail_urls(admin_client, admin):
+    comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+    review_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+    return review_url, f'{review_url}comments/{comments[0]["id"]}/'
+
+
+class Test19ConditionalRequests:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_not_modified(self, client, admin_client, admin):
+        for url in detail_urls(admin_client, admin):
+            response = client.get(url)
+            assert response.status_code == 200
+            for header in ('ETag', 'Last-Modified'):
+                assert response.has_header(header), (
+                    f'Проверьте, что GET `{url}` возвращает `{header}`'
+                )
+            with CaptureQueriesContext(connection) as context:
+                repeated = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            assert repeated.status_code == 304, (
+                f'Проверьте, что GET `{url}` с актуальным `If-None-Match` '
+                'возвращает 304'
+            )
+            assert repeated['ETag'] == response['ETag']
+            assert len(context) == 1, (
+                f'Проверьте, что ответ 304 на `{url}` требует одного запроса к БД'
+            )
+            repeated = client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+            )
+            assert repeated.status_code == 304
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_modified(self, client, admin_client, admin):
+        for url in detail_urls(admin_client, admin):
+            etag = client.get(url)['ETag']
+            response = admin_client.patch(url, data={'text': 'Исправлено'})
+            assert response.status_code == 200
+            assert response['ETag'] != etag, (
+                f'Проверьте, что PATCH `{url}` возвращает новый `ETag`'
+            )
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                f'Проверьте, что после изменения GET `{url}` '
+                'со старым `If-None-Match` возвращает 200'
+            )
+            assert response.json()['text'] == 'Исправлено'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_if_match(self, client, admin_client, admin):
+        for url in detail_urls(admin_client, admin):
+            etag = client.get(url)['ETag']
+            response = admin_client.patch(
+                url, data={'text': 'Первая правка'}, HTTP_IF_MATCH=etag
+            )
+            assert response.status_code == 200
+            response = admin_client.patch(
+                url, data={'text': 'Вторая правка'}, HTTP_IF_MATCH=etag
+            )
+            assert response.status_code == 412, (
+                f'Проверьте, что PATCH `{url}` с устаревшим `If-Match` '
+                'возвращает 412'
+            )
+            assert client.get(url).json()['text'] == 'Первая правка'
+            response = admin_client.delete(url, HTTP_IF_MATCH=etag)
+            assert response.status_code == 412
@@ -0,0 +1,94 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from titcatgen.models import Title
+
+from .common import create_reviews
+
+URL = '/api/v1/titles/top/'
+
+
+def create_ranked(admin_client, admin):
+    """Три оценки 9 у первого произведения и одна 10 у второго."""
+    reviews, titles, _, _ = create_reviews(admin_client, admin)
+    for review in reviews:
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/',
+            data={'score': 9},
+        )
+    admin_client.post(
+        f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+        data={'text': 'Шедевр', 'score': 10},
+    )
+    return titles
+
+
+def top_ids(client, query=''):
+    response = client.get(f'{URL}{query}')
+    assert response.status_code == 200, (
+        f'Проверьте, что GET `{URL}{query}` возвращает 200'
+    )
+    return [title['id'] for title in response.json()]
+
+
+class Test20TitleTop:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_top(self, client, admin_client, admin):
+        titles = create_ranked(admin_client, admin)
+        first, second = titles[0]['id'], titles[1]['id']
+        assert top_ids(client) == [first, second], (
+            'Проверьте, что байесовский рейтинг ставит три оценки 9 '
+            'выше одной оценки 10'
+        )
+        assert top_ids(client, '?by=reviews') == [first, second]
+        assert top_ids(client, '?limit=1') == [first]
+        assert top_ids(client, '?category=books') == [second], (
+            f'Проверьте, что `{URL}` поддерживает фильтры TitleFilter'
+        )
+        assert top_ids(client, '?genre=comedy') == [first]
+        data = client.get(URL).json()
+        assert data[0]['reviews_count'] == 3
+        # (27 + 5 * 6) / (3 + 5)
+        assert data[0]['weighted_rating'] == pytest.approx(7.125)
+        assert data[1]['rating'] == 10
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_validation(self, client):
+        for query in ('?by=name', '?limit=0', '?limit=1000'):
+            response = client.get(f'{URL}{query}')
+            assert response.status_code == 400, (
+                f'Проверьте, что GET `{URL}{query}` возвращает 400'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_recalculate(self, admin_client, admin):
+        titles = create_ranked(admin_client, admin)
+        expected = dict(Title.objects.values_list('id', 'weighted_rating'))
+        Title.objects.update(weighted_rating=None)
+        call_command('recalculate_ratings', stdout=open('/dev/null', 'w'))
+        assert dict(
+            Title.objects.values_list('id', 'weighted_rating')
+        ) == pytest.approx(expected), (
+            'Проверьте, что recalculate_ratings пересчитывает '
+            'байесовский рейтинг'
+        )
+        assert expected[titles[0]['id']] == pytest.approx(7.125)
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='План запроса проверяется только для SQLite',
+    )
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('by', ['rating', 'reviews'])
+    @pytest.mark.parametrize('filters', [{}, {'category__slug': 'films'}])
+    def test_04_plan(self, by, filters):
+        queryset = Title.objects.for_api().filter(**filters).top(by)[:10]
+        plan = [line.strip() for line in queryset.explain().splitlines()]
+        assert not any(
+            line.endswith('SCAN titcatgen_title')
+            or line.endswith('SCAN TABLE titcatgen_title')
+            or 'TEMP B-TREE' in line
+            for line in plan
+        ), f'Рейтинг `{by}` с фильтром {filters} должен идти по индексу: {plan}'
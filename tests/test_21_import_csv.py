@@ -0,0 +1,159 @@
+import io
+from datetime import datetime, timezone
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review
+from titcatgen.models import Category, Title
+from users.models import User
+
+CSV_DATA = {
+    'users.csv': (
+        'id,username,email,role,bio,first_name,last_name\n'
+        '100,reader,reader@yamdb.fake,user,,,\n'
+        '101,critic,critic@yamdb.fake,user,,,\n'
+    ),
+    'category.csv': 'id,name,slug\n1,Фильм,movie\n',
+    'genre.csv': 'id,name,slug\n1,Драма,drama\n',
+    'titles.csv': (
+        'id,name,year,category_id\n'
+        '1,Побег из Шоушенка,1994,1\n'
+        '2,Без категории,1990,7\n'
+        '3,Из будущего,2999,1\n'
+    ),
+    'genre_title.csv': 'id,title_id,genre_id\n1,1,1\n2,1,5\n',
+    'review.csv': (
+        'id,title_id,text,author_id,score,pub_date\n'
+        '1,1,Отлично,100,10,2019-09-24T21:08:21.567Z\n'
+        '2,1,Неплохо,101,6,2019-09-25T21:08:21.567Z\n'
+        '3,9,Нет произведения,100,5,2019-09-26T21:08:21.567Z\n'
+        '4,1,Нет автора,999,5,2019-09-26T21:08:21.567Z\n'
+        '5,1,Слишком высоко,100,11,2019-09-26T21:08:21.567Z\n'
+    ),
+    'comments.csv': 'id,review_id,text,author_id,pub_date\n',
+}
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    for filename, content in CSV_DATA.items():
+        (tmp_path / filename).write_text(content, encoding='utf-8')
+    return tmp_path
+
+
+def import_csv(path, *args):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    call_command(
+        'import_csv', f'--path={path}', *args, stdout=stdout, stderr=stderr
+    )
+    return stdout.getvalue(), stderr.getvalue()
+
+
+class Test21ImportCsv:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_dry_run(self, csv_dir):
+        stdout, dry_stderr = import_csv(csv_dir, '--dry-run')
+        assert '[dry-run]' in stdout
+        assert 'review.csv: создано 2, обновлено 0, пропущено 3' in stdout, (
+            'Проверьте, что `import_csv --dry-run` проверяет строки '
+            'валидаторами модели'
+        )
+        assert not User.objects.exists(), (
+            'Проверьте, что `import_csv --dry-run` ничего не пишет в базу'
+        )
+        assert not Title.objects.exists()
+        assert not Review.objects.exists()
+        _, stderr = import_csv(csv_dir)
+        assert stderr == dry_stderr, (
+            'Проверьте, что `--dry-run` сообщает о тех же строках, '
+            'что и настоящая загрузка'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_unknown_relations(self, csv_dir):
+        _, stderr = import_csv(csv_dir)
+        assert list(Title.objects.values_list('pk', flat=True)) == [1], (
+            'Проверьте, что `import_csv` пропускает строки со ссылками '
+            'на несуществующие записи'
+        )
+        assert list(
+            Title.genre.through.objects.values_list('genre_id', flat=True)
+        ) == [1]
+        assert sorted(Review.objects.values_list('pk', flat=True)) == [1, 2]
+        for message in (
+            'titles.csv:3: category_id=7',
+            'genre_title.csv:3: genre_id=5',
+            'review.csv:4: title_id=9',
+            'review.csv:5: author_id=999',
+            'titles.csv:4: year=2999',
+            'review.csv:6: score=11',
+        ):
+            assert message in stderr, (
+                f'Проверьте, что `import_csv` сообщает о пропуске: {message}'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_upsert(self, csv_dir):
+        import_csv(csv_dir)
+        (csv_dir / 'category.csv').write_text(
+            'id,name,slug\n1,Кино,movie\n2,Книга,book\n', encoding='utf-8'
+        )
+        stdout, _ = import_csv(csv_dir)
+        assert 'category.csv: создано 1, обновлено 0, пропущено 1' in stdout
+        assert Category.objects.get(pk=1).name == 'Фильм', (
+            'Проверьте, что без `--upsert` существующие записи не меняются'
+        )
+        stdout, _ = import_csv(csv_dir, '--upsert')
+        assert 'category.csv: создано 0, обновлено 2, пропущено 0' in stdout
+        assert Category.objects.get(pk=1).name == 'Кино', (
+            'Проверьте, что `import_csv --upsert` обновляет записи'
+        )
+        assert Review.objects.count() == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_derived_data(self, client, csv_dir):
+        import_csv(csv_dir)
+        title = Title.objects.get(pk=1)
+        assert (title.rating_sum, title.rating_count) == (16, 2), (
+            'Проверьте, что после `import_csv` счётчики рейтинга '
+            'пересчитываются по загруженным отзывам'
+        )
+        assert title.rating == pytest.approx(8)
+        # (16 + 5 * 6) / (2 + 5)
+        assert title.weighted_rating == pytest.approx(46 / 7)
+        response = client.get('/api/v1/titles/?q=шоушенка')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что после `import_csv` обновляется поисковый индекс'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_csv_dates(self, csv_dir):
+        import_csv(csv_dir)
+        assert Review.objects.get(pk=1).pub_date == datetime(
+            2019, 9, 24, 21, 8, 21, 567000, tzinfo=timezone.utc
+        ), 'Проверьте, что `import_csv` сохраняет даты из CSV'
+        assert Review._meta.get_field('pub_date').auto_now_add, (
+            'Проверьте, что `import_csv` не меняет определение полей модели'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_upsert_invalidates_cache(self, client, csv_dir):
+        import_csv(csv_dir)
+        url = '/api/v1/titles/1/'
+        response = client.get(url)
+        assert response.json()['name'] == 'Побег из Шоушенка'
+        updated_at = Review.objects.get(pk=1).updated_at
+        (csv_dir / 'titles.csv').write_text(
+            'id,name,year,category_id\n1,Шоушенк,1994,1\n', encoding='utf-8'
+        )
+        import_csv(csv_dir, '--upsert')
+        assert Review.objects.get(pk=1).updated_at > updated_at, (
+            'Проверьте, что `import_csv --upsert` обновляет `updated_at`'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == 200, (
+            'Проверьте, что после `import_csv` кеш произведений сброшен'
+        )
+        assert response.json()['name'] == 'Шоушенк'
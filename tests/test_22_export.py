@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Review
+from titcatgen.models import Title
+
+from .common import auth_client, create_comments
+
+EXPORT_URLS = {
+    'review': '/api/v1/titles/reviews/export/',
+    'comments': '/api/v1/titles/comments/export/',
+}
+
+
+def export(client, name, export_format):
+    response = client.get(
+        EXPORT_URLS[name], {'export_format': export_format}
+    )
+    assert response.status_code == 200, (
+        f'Проверьте, что GET `{EXPORT_URLS[name]}` доступен администратору'
+    )
+    assert response['Content-Disposition'] == (
+        f'attachment; filename="{name}.{export_format}"'
+    )
+    return b''.join(response.streaming_content).decode()
+
+
+class Test22Export:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_permissions(self, client, admin_client, admin):
+        _, _, _, user, moderator = create_comments(admin_client, admin)
+        for url in EXPORT_URLS.values():
+            assert client.get(url).status_code == 401, (
+                f'Проверьте, что GET `{url}` без токена возвращает 401'
+            )
+            for author in (user, moderator):
+                response = auth_client(author).get(url)
+                assert response.status_code == 403, (
+                    f'Проверьте, что GET `{url}` доступен только '
+                    'администратору'
+                )
+            response = admin_client.get(url, {'export_format': 'xml'})
+            assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_ndjson(self, admin_client, admin):
+        create_comments(admin_client, admin)
+        rows = [
+            json.loads(line)
+            for line in export(admin_client, 'review', 'ndjson').splitlines()
+        ]
+        assert [row['id'] for row in rows] == list(
+            Review.objects.order_by('pk').values_list('pk', flat=True)
+        ), 'Проверьте, что выгрузка отзывов содержит весь каталог'
+        assert set(rows[0]) == {
+            'id', 'title_id', 'text', 'author_id', 'score', 'pub_date'
+        }
+        rows = export(admin_client, 'comments', 'ndjson').splitlines()
+        assert len(rows) == Comment.objects.count()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_csv(self, admin_client, admin):
+        create_comments(admin_client, admin)
+        for name, model in (('review', Review), ('comments', Comment)):
+            header, *rows = csv.reader(
+                io.StringIO(export(admin_client, name, 'csv'))
+            )
+            ids = model.objects.order_by('pk').values_list('pk', flat=True)
+            assert [row[0] for row in rows] == list(map(str, ids)), (
+                f'Проверьте, что CSV-выгрузка `{name}` содержит все записи'
+            )
+            assert 'pub_date' in header
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_import_round_trip(self, admin_client, admin, tmp_path):
+        create_comments(admin_client, admin)
+        fields = {
+            Review: ('id', 'title_id', 'text', 'author_id', 'score',
+                     'pub_date'),
+            Comment: ('id', 'review_id', 'text', 'author_id', 'pub_date'),
+        }
+        before = {
+            model: list(model.objects.order_by('pk').values_list(*columns))
+            for model, columns in fields.items()
+        }
+        counters = Title.objects.values_list('pk', 'rating_sum', 'rating')
+        expected_counters = list(counters.order_by('pk'))
+        for name in EXPORT_URLS:
+            (tmp_path / f'{name}.csv').write_text(
+                export(admin_client, name, 'csv'), encoding='utf-8'
+            )
+        Review.objects.all().delete()
+        assert not Comment.objects.exists()
+
+        call_command(
+            'import_csv', f'--path={tmp_path}',
+            stdout=io.StringIO(), stderr=io.StringIO(),
+        )
+        for model, columns in fields.items():
+            assert list(
+                model.objects.order_by('pk').values_list(*columns)
+            ) == before[model], (
+                f'Проверьте, что CSV-выгрузка `{model.__name__}` '
+                'загружается обратно командой import_csv'
+            )
+        assert list(counters.order_by('pk')) == expected_counters, (
+            'Проверьте, что после загрузки выгрузки рейтинги пересчитаны'
+        )
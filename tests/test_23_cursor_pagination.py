@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.pagination import PubDateCursorPagination
+from reviews.models import Comment, Review
+from titcatgen.models import Title
+from users.models import User
+
+from .common import create_titles
+
+ROWS = 8
+
+
+def create_rows(admin_client):
+    titles, _, _ = create_titles(admin_client)
+    title = Title.objects.get(pk=titles[0]['id'])
+    User.objects.bulk_create(
+        User(username=f'reader{number}', email=f'reader{number}@yamdb.fake')
+        for number in range(ROWS)
+    )
+    authors = User.objects.filter(username__startswith='reader')
+    reviews = [
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5
+        )
+        for author in authors
+    ]
+    for author in authors:
+        Comment.objects.create(
+            review=reviews[0], author=author, text='Комментарий'
+        )
+    # одинаковая дата: порядок внутри страницы задаёт только id
+    same_date = timezone.now()
+    Review.objects.update(pub_date=same_date)
+    Comment.objects.update(pub_date=same_date)
+    review_url = f'/api/v1/titles/{title.pk}/reviews/'
+    return review_url, f'{review_url}{reviews[0].pk}/comments/'
+
+
+def walk(client, url):
+    ids = []
+    url = f'{url}?cursor='
+    while url:
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200
+        assert not any(
+            '__count' in query['sql'] for query in context.captured_queries
+        ), f'Проверьте, что курсорная пагинация `{url}` не выполняет COUNT'
+        data = response.json()
+        assert 'count' not in data
+        ids.extend(item['id'] for item in data['results'])
+        url = data['next']
+    return ids
+
+
+class Test23CursorPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_equal_pub_date(self, client, admin_client, monkeypatch):
+        monkeypatch.setattr(PubDateCursorPagination, 'page_size', 3)
+        urls = create_rows(admin_client)
+        for url, model in zip(urls, (Review, Comment)):
+            ids = walk(client, url)
+            assert ids == list(
+                model.objects.order_by('id').values_list('id', flat=True)
+            ), (
+                f'Проверьте, что страницы `{url}?cursor=` с одинаковой '
+                '`pub_date` не пропускают и не повторяют записи'
+            )
+            assert len(ids) == ROWS
@@ -0,0 +1,89 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.authentication import user_version_name
+from api.cache import get_version
+
+from .common import auth_client
+
+URL = '/api/v1/users/'
+
+
+def user_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "users_user"' in query['sql']
+    ]
+
+
+class Test24AuthCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cached_user(self, user):
+        client = auth_client(user)
+        assert client.get(URL).status_code == 403
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(URL)
+        assert response.status_code == 403
+        assert not user_queries(context), (
+            'Проверьте, что повторный запрос берёт пользователя из кеша'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_role_change(self, admin_client, user):
+        client = auth_client(user)
+        assert client.get(URL).status_code == 403
+        response = admin_client.patch(
+            f'{URL}{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == 200
+        assert client.get(URL).status_code == 200, (
+            'Проверьте, что новая роль пользователя действует со '
+            'следующего запроса, несмотря на кеш'
+        )
+        admin_client.patch(f'{URL}{user.username}/', data={'role': 'user'})
+        assert client.get(URL).status_code == 403
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_deactivation(self, user):
+        client = auth_client(user)
+        assert client.get(f'{URL}me/').status_code == 200
+        user.is_active = False
+        user.save()
+        response = client.get(f'{URL}me/')
+        assert response.status_code == 401, (
+            'Проверьте, что отключённый пользователь не проходит '
+            'аутентификацию, даже если он есть в кеше'
+        )
+        user.is_active = True
+        user.save()
+        assert client.get(f'{URL}me/').status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_deleted_user(self, admin_client, user):
+        client = auth_client(user)
+        assert client.get(f'{URL}me/').status_code == 200
+        admin_client.delete(f'{URL}{user.username}/')
+        assert client.get(f'{URL}me/').status_code == 401, (
+            'Проверьте, что удалённый пользователь не остаётся в кеше'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_cached_fields(self, user):
+        user.set_password('secret-password')
+        user.save()
+        client = auth_client(user)
+        response = client.get(f'{URL}me/')
+        assert response.status_code == 200
+        assert response.json()['email'] == user.email, (
+            'Проверьте, что `users/me/` возвращает все поля пользователя'
+        )
+        version = get_version(user_version_name(user.pk))
+        cached = cache.get(f'auth:user:{user.pk}:{version}')
+        assert user.username in cached
+        assert user.password not in cached, (
+            'Проверьте, что пароль пользователя не попадает в кеш'
+        )
+        assert user.confirmation_code not in cached
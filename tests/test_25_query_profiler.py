@@ -0,0 +1,59 @@
+import logging
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.middleware import QueryBudgetExceeded
+
+from .common import create_reviews
+
+LIST_URL = '/api/v1/titles/'
+EXPORT_URL = '/api/v1/titles/export/'
+
+
+class Test25QueryProfiler:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_headers(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        for url in (LIST_URL, f'{LIST_URL}{titles[0]["id"]}/reviews/'):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == 200
+            assert response['X-DB-Queries'] == str(len(context)), (
+                f'Проверьте, что `X-DB-Queries` ответа `{url}` совпадает '
+                'с числом SQL-запросов'
+            )
+            assert float(response['X-DB-Time-ms']) >= 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_budget(self, client, settings, caplog):
+        settings.QUERY_BUDGETS = {'GET api:titles-list': 0}
+        with pytest.raises(QueryBudgetExceeded, match='api:titles-list'):
+            client.get(LIST_URL)
+
+        settings.QUERY_BUDGET_RAISE = False
+        with caplog.at_level(logging.WARNING, logger='api.middleware'):
+            response = client.get(LIST_URL)
+        assert response.status_code == 200
+        assert 'при бюджете 0' in caplog.text, (
+            'Проверьте, что без QUERY_BUDGET_RAISE превышение бюджета '
+            'пишется в лог'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_streaming(self, admin_client, admin, settings):
+        create_reviews(admin_client, admin)
+        response = admin_client.get(EXPORT_URL)
+        assert response.streaming
+        assert not response.has_header('X-DB-Queries'), (
+            'Проверьте, что потоковый ответ не получает `X-DB-Queries`: '
+            'запросы выполняются при чтении тела'
+        )
+        assert len(b''.join(response.streaming_content).splitlines()) == 2
+
+        settings.QUERY_BUDGETS = {'GET api:titles-export': 0}
+        response = admin_client.get(EXPORT_URL)
+        with pytest.raises(QueryBudgetExceeded, match='api:titles-export'):
+            b''.join(response.streaming_content)
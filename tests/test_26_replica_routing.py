@@ -0,0 +1,124 @@
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from api_yamdb.db import (PrimaryReplicaRouter, check_connections,
+                          read_from_replicas)
+from titcatgen.models import Title
+
+from .common import create_titles
+
+REPLICA = 'replica_0'
+
+
+@pytest.fixture
+def replica(settings):
+    # зеркало тестовой базы: те же данные, но отдельное соединение
+    settings.DATABASES[REPLICA] = dict(
+        settings.DATABASES['default'], TEST={'MIRROR': 'default'}
+    )
+    settings.DATABASE_REPLICAS = [REPLICA]
+    yield connections[REPLICA]
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del settings.DATABASES[REPLICA]
+
+
+def run_request(request):
+    with CaptureQueriesContext(connections['default']) as primary, \
+            CaptureQueriesContext(connections[REPLICA]) as replica:
+        response = request()
+    return response, len(primary), len(replica)
+
+
+class Test26ReplicaRouting:
+
+    def test_01_router(self, replica, settings):
+        router = PrimaryReplicaRouter()
+        settings.DATABASE_REPLICAS = []
+        with read_from_replicas():
+            assert router.db_for_read(Title) == 'default', (
+                'Проверьте, что зеркало тестовой базы без DATABASE_REPLICAS '
+                'не считается репликой'
+            )
+        settings.DATABASE_REPLICAS = [REPLICA]
+        assert router.db_for_read(Title) == 'default'
+        with read_from_replicas():
+            assert router.db_for_read(Title) == REPLICA, (
+                'Проверьте, что внутри read_from_replicas() чтение '
+                'идёт на реплику'
+            )
+            assert router.db_for_write(Title) == 'default'
+        assert router.db_for_read(Title) == 'default'
+        assert not router.allow_migrate(REPLICA, 'titcatgen')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_views(self, admin_client, replica):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        reviews_url = f'{title_url}reviews/'
+        for url in ('/api/v1/titles/', title_url, reviews_url):
+            response, primary, replica_queries = run_request(
+                lambda: admin_client.get(url)
+            )
+            assert response.status_code == 200
+            assert primary == 0 and replica_queries > 0, (
+                f'Проверьте, что GET `{url}` читает данные с реплики'
+            )
+        response, primary, replica_queries = run_request(
+            lambda: admin_client.post(
+                reviews_url, data={'text': 'Отзыв', 'score': 7}
+            )
+        )
+        assert response.status_code == 201
+        assert primary > 0 and replica_queries == 0, (
+            f'Проверьте, что POST `{reviews_url}` идёт в основную базу'
+        )
+        response, primary, _ = run_request(
+            lambda: admin_client.patch(title_url, data={'year': 2000})
+        )
+        assert response.status_code == 200
+        assert primary > 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_cached_response_from_primary(self, client, admin_client,
+                                             replica):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+        response, primary, replica_queries = run_request(
+            lambda: client.get(url)
+        )
+        assert response.status_code == 200
+        assert primary > 0 and replica_queries == 0, (
+            f'Проверьте, что ответ `{url}`, который попадёт в кеш, '
+            'читается с основной базы, а не с отстающей реплики'
+        )
+        response, primary, replica_queries = run_request(
+            lambda: client.get(url)
+        )
+        assert response.status_code == 200
+        assert primary == replica_queries == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_health_check_interval(self, settings, monkeypatch):
+        conn = connections['default']
+        conn.ensure_connection()
+        monkeypatch.setitem(conn.settings_dict, 'HEALTH_CHECKS', True)
+        checks = []
+
+        def is_usable():
+            checks.append(conn.alias)
+            return True
+
+        monkeypatch.setattr(conn, 'is_usable', is_usable)
+        settings.DB_HEALTH_CHECK_INTERVAL = 30
+        for _ in range(3):
+            check_connections()
+        assert not checks, (
+            'Проверьте, что новое соединение не проверяется в начале '
+            'каждого запроса'
+        )
+        settings.DB_HEALTH_CHECK_INTERVAL = 0
+        check_connections()
+        check_connections()
+        assert len(checks) == 2
@@ -0,0 +1,114 @@
+import io
+from datetime import timedelta
+from smtplib import SMTPException
+
+import pytest
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from users.models import EmailOutbox
+
+
+class FlakyBackend(BaseEmailBackend):
+    """Почтовый бэкенд, который считает соединения и может падать."""
+    opened = 0
+    sent = []
+    fail_open = False
+    fail_send = False
+
+    def open(self):
+        FlakyBackend.opened += 1
+        if self.fail_open:
+            raise SMTPException('Сервер недоступен')
+
+    def send_messages(self, messages):
+        if self.fail_send:
+            raise SMTPException('Письмо отклонено')
+        FlakyBackend.sent.extend(messages)
+        return len(messages)
+
+
+@pytest.fixture
+def backend(settings, monkeypatch):
+    settings.EMAIL_BACKEND = f'{__name__}.FlakyBackend'
+    monkeypatch.setattr(FlakyBackend, 'opened', 0)
+    monkeypatch.setattr(FlakyBackend, 'sent', [])
+    return FlakyBackend
+
+
+def create_emails(count):
+    return EmailOutbox.objects.bulk_create(
+        EmailOutbox(to_email=f'user{number}@yamdb.fake', body='Код: 1')
+        for number in range(count)
+    )
+
+
+def run_worker(*args):
+    call_command(
+        'run_mail_worker', '--once', *args,
+        stdout=io.StringIO(), stderr=io.StringIO(),
+    )
+
+
+class Test27MailWorker:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_batches(self, backend):
+        create_emails(5)
+        run_worker('--batch-size', '2')
+        assert len(backend.sent) == 5
+        assert backend.opened == 3, (
+            'Проверьте, что каждая пачка писем отправляется через одно '
+            'соединение'
+        )
+        assert not EmailOutbox.objects.filter(sent_at__isnull=True).exists()
+        assert set(EmailOutbox.objects.values_list('attempts', flat=True)) == {1}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_retry_backoff(self, backend, monkeypatch):
+        monkeypatch.setattr(backend, 'fail_send', True)
+        create_emails(1)
+        started = timezone.now()
+        run_worker('--retry-delay', '30')
+        email = EmailOutbox.objects.get()
+        assert email.attempts == 1 and email.sent_at is None
+        assert email.last_error == 'Письмо отклонено'
+        assert email.next_attempt_at >= started + timedelta(seconds=30), (
+            'Проверьте, что неудачная отправка откладывается на --retry-delay'
+        )
+
+        run_worker('--retry-delay', '30')
+        assert EmailOutbox.objects.get().attempts == 1, (
+            'Проверьте, что письмо не отправляется до next_attempt_at'
+        )
+
+        EmailOutbox.objects.update(next_attempt_at=timezone.now())
+        started = timezone.now()
+        run_worker('--retry-delay', '30')
+        email = EmailOutbox.objects.get()
+        assert email.attempts == 2
+        assert email.next_attempt_at >= started + timedelta(seconds=60), (
+            'Проверьте, что задержка повтора удваивается'
+        )
+
+        monkeypatch.setattr(backend, 'fail_send', False)
+        EmailOutbox.objects.update(next_attempt_at=timezone.now())
+        run_worker()
+        email = EmailOutbox.objects.get()
+        assert email.attempts == 3 and email.sent_at is not None
+        assert email.last_error == ''
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_max_attempts(self, backend, monkeypatch):
+        monkeypatch.setattr(backend, 'fail_open', True)
+        create_emails(2)
+        run_worker('--retry-delay', '0', '--max-attempts', '3')
+        assert backend.opened == 3, (
+            'Проверьте, что после --max-attempts неудач письмо больше '
+            'не отправляется'
+        )
+        assert list(
+            EmailOutbox.objects.values_list('attempts', 'last_error')
+        ) == [(3, 'Сервер недоступен')] * 2
+        assert not EmailOutbox.objects.filter(sent_at__isnull=False).exists()
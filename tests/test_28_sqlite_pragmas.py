@@ -0,0 +1,46 @@
+import pytest
+from django.db import connection, connections
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Настройки только для SQLite'
+)
+
+
+@pytest.fixture
+def file_connection(tmp_path):
+    # тестовая база в памяти не переходит в WAL, поэтому нужен файл
+    default = connections['default']
+    settings_dict = dict(
+        default.settings_dict, NAME=str(tmp_path / 'pragmas.sqlite3')
+    )
+    fresh = type(default)(settings_dict, alias='pragmas')
+    yield fresh
+    fresh.close()
+
+
+def pragma(conn, name):
+    with conn.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+class Test28SqlitePragmas:
+
+    @pytest.mark.django_db
+    def test_01_new_connection(self, file_connection, settings):
+        assert pragma(file_connection, 'journal_mode') == 'wal', (
+            'Проверьте, что новое соединение с SQLite работает в режиме WAL'
+        )
+        # NORMAL
+        assert pragma(file_connection, 'synchronous') == 1
+        assert pragma(file_connection, 'foreign_keys') == 1, (
+            'Проверьте, что настройка SQLite не отключает внешние ключи'
+        )
+        assert pragma(file_connection, 'busy_timeout') == (
+            settings.SQLITE_PRAGMAS['busy_timeout']
+        )
+        assert pragma(file_connection, 'cache_size') == (
+            settings.SQLITE_PRAGMAS['cache_size']
+        )
+        # MEMORY
+        assert pragma(file_connection, 'temp_store') == 2